@@ -0,0 +1,122 @@
+"""
+Benchmark del motor de gráficas con la plataforma Qt 'offscreen'.
+
+Compara el tiempo por frame (añadir una muestra a cada curva + repintar) de:
+  - clasico: PlotDataItem con setData de la lista completa y autorange,
+    como hacía el dashboard antes.
+  - motor:   GraficaHistorial + MotorGraficas (diezmado min/max, ejes fijos).
+Cada modo se mide con todas las gráficas a la vista y dentro de un
+QScrollArea que solo muestra las primeras filas, como en el dashboard.
+
+Uso:
+    python benchmark_graficas.py --curvas 50 --puntos 3600 --frames 60
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import random
+import statistics
+import time
+import pyqtgraph as pg
+from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout, QScrollArea
+
+from graficas import GraficaHistorial, MotorGraficas
+
+COLORES = ['c', '#FFB84C', '#4CFFB8', '#FF4C4C', '#4B9BFF']
+
+
+def crear_ventana(graficas, scroll, columnas=5):
+    contenido = QWidget()
+    layout = QGridLayout(contenido)
+    for i, grafica in enumerate(graficas):
+        grafica.setMinimumHeight(180)
+        layout.addWidget(grafica, i // columnas, i % columnas)
+    alto = 200 * ((len(graficas) + columnas - 1) // columnas)
+    if scroll:
+        ventana = QScrollArea()
+        ventana.setWidgetResizable(True)
+        ventana.setWidget(contenido)
+        ventana.resize(1600, 400) # Solo ~2 filas a la vista
+    else:
+        ventana = contenido
+        ventana.resize(1600, alto)
+    ventana.show()
+    return ventana
+
+
+def medir(app, ventana, paso, frames):
+    """ Ejecuta 'paso' y repinta la ventana de forma síncrona; devuelve ms por frame. """
+    tiempos = []
+    for _ in range(frames):
+        inicio = time.perf_counter()
+        paso()
+        ventana.repaint()
+        app.processEvents()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def bench_clasico(app, args, rng, scroll):
+    graficas, series = [], []
+    for i in range(args.curvas):
+        plot = pg.PlotWidget()
+        plot.setYRange(0, 100)
+        datos = [rng.uniform(0, 100) for _ in range(args.puntos)]
+        curva = plot.plot(datos, pen=COLORES[i % len(COLORES)])
+        graficas.append(plot)
+        series.append((datos, curva))
+    ventana = crear_ventana(graficas, scroll)
+    app.processEvents()
+
+    def paso():
+        for datos, curva in series:
+            datos.pop(0)
+            datos.append(rng.uniform(0, 100))
+            curva.setData(datos)
+    return medir(app, ventana, paso, args.frames)
+
+
+def bench_motor(app, args, rng, scroll):
+    motor = MotorGraficas(fps_max=1000)
+    graficas, curvas = [], []
+    for i in range(args.curvas):
+        grafica = GraficaHistorial("", args.puntos, motor)
+        curva = grafica.añadir_curva(COLORES[i % len(COLORES)])
+        graficas.append(grafica)
+        curvas.append(curva)
+    ventana = crear_ventana(graficas, scroll)
+    app.processEvents()
+    for curva in curvas: # Llenar 1 h de historial
+        for _ in range(args.puntos):
+            curva.añadir(rng.uniform(0, 100))
+    motor.volcar()
+
+    def paso():
+        for curva in curvas:
+            curva.añadir(rng.uniform(0, 100))
+        motor.volcar()
+    return medir(app, ventana, paso, args.frames)
+
+
+def resumen(nombre, tiempos):
+    tiempos = sorted(tiempos)
+    p95 = tiempos[int(len(tiempos) * 0.95) - 1]
+    print(f"{nombre:16s} media {statistics.mean(tiempos):7.2f} ms | "
+          f"mediana {statistics.median(tiempos):7.2f} ms | p95 {p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--curvas", type=int, default=50)
+    parser.add_argument("--puntos", type=int, default=3600, help="Historial por curva (3600 = 1 h a 1 s)")
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    print(f"{args.curvas} curvas, {args.puntos} puntos, {args.frames} frames "
+          f"(plataforma Qt: {app.platformName()})")
+    for scroll in (False, True):
+        sufijo = " (scroll)" if scroll else ""
+        resumen("clasico" + sufijo, bench_clasico(app, args, random.Random(0), scroll))
+        resumen("motor" + sufijo, bench_motor(app, args, random.Random(0), scroll))
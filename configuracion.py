@@ -0,0 +1,216 @@
+"""
+Configuración del dashboard: catálogo de fuentes, paneles y métricas, valores
+por defecto y lectura/validación de dashboard_config.json.
+
+No crea widgets ni accede al hardware (pyqtgraph solo se usa para validar
+colores), así que cargar_config se puede probar sin abrir ventanas.
+"""
+import sys
+import os
+import copy
+import json
+import pyqtgraph as pg
+
+# --- CATÁLOGO (fuentes, paneles y métricas) ---
+# Añadir una métrica nueva es añadir su fuente y su panel aquí, más los
+# métodos de MonitorDashboard que estos nombran (muestrear_X, preparar_X,
+# _construir_panel_X).
+
+# Fuentes de datos. Cada una indica:
+#   intervalo:  muestreo por defecto (ms)
+#   muestrear:  método que llama su temporizador
+#   preparar:   inicialización perezosa, la primera vez que un panel la usa
+#   reiniciar:  puesta a cero de contadores al volver a usarse tras pararla
+#   requiere:   fuentes que deben estar preparadas antes (sin arrancar su timer)
+CATALOGO_FUENTES = {
+    "cpu": {"intervalo": 1000, "muestrear": "muestrear_cpu"},
+    "gpu": {"intervalo": 1000, "muestrear": "muestrear_gpu", "preparar": "preparar_gpu"},
+    "ram": {"intervalo": 1000, "muestrear": "muestrear_ram"},
+    "discos": {"intervalo": 1000, "muestrear": "muestrear_discos",
+               "preparar": "preparar_discos", "reiniciar": "reiniciar_discos"},
+    "red": {"intervalo": 1000, "muestrear": "muestrear_red",
+            "preparar": "preparar_red", "reiniciar": "preparar_red"},
+    "procesos": {"intervalo": 3000, "muestrear": "actualizar_top_procesos",
+                 "preparar": "prime_processes"},
+    "tirones": {"intervalo": 250, "muestrear": "muestrear_tirones",  # Muestreo rápido
+                "preparar": "preparar_tirones", "reiniciar": "preparar_tirones",
+                "requiere": ("gpu",)},  # Solo necesita NVML, no el timer de la GPU
+}
+
+# Paneles: fuentes fijas que usan, método que los construye ("desmontar", si
+# existe, limpia el estado que el panel deja fuera de su dict al quitarlo) y su
+# configuración por defecto. El JSON solo necesita incluir lo que cambia.
+# Un panel con "activo": false no crea widgets y, si ningún otro panel usa
+# sus fuentes, tampoco las muestrea. Los paneles con "metricas" usan además
+# las fuentes de esas métricas.
+CATALOGO_PANELES = {
+    "cpu": {"fuentes": ("cpu",), "construir": "_construir_panel_cpu",
+            "por_defecto": {"activo": True, "fila": 0, "columna": 0, "umbrales": [70, 90],
+                            "grafica": {"columna": 1, "puntos": 60, "color": "c"}}},
+    "gpu": {"fuentes": ("gpu",), "construir": "_construir_panel_gpu",
+            "por_defecto": {"activo": True, "fila": 1, "columna": 0, "umbrales": [70, 90],
+                            "grafica": {"columna": 1, "puntos": 60, "color": "#FFB84C"}}},
+    "ram": {"fuentes": ("ram",), "construir": "_construir_panel_ram",
+            "por_defecto": {"activo": True, "fila": 2, "columna": 0, "umbrales": [70, 90],
+                            "grafica": {"columna": 1, "puntos": 60, "color": "#4CFFB8"}}},
+    "discos": {"fuentes": ("discos",), "construir": "_construir_panel_discos",
+               "por_defecto": {"activo": True, "fila": 3, "columna": 0, "umbrales": [70, 90]}},
+    "picos": {"fuentes": (), "construir": "_construir_panel_picos",
+              "por_defecto": {"activo": True, "fila": 3, "columna": 1,
+                              "metricas": ["cpu", "gpu", "vram", "ram"], "pico": 95, "rearme": 90}},
+    "red": {"fuentes": ("red",), "construir": "_construir_panel_red",
+            "por_defecto": {"activo": True, "fila": 4, "columna": 0}},
+    "procesos": {"fuentes": ("procesos",), "construir": "_construir_panel_procesos",
+                 "por_defecto": {"activo": True, "fila": 4, "columna": 1, "cantidad": 3}},
+    "tirones": {"fuentes": ("tirones", "procesos"), "construir": "_construir_panel_tirones",
+                "por_defecto": {"activo": True, "fila": 5, "columna": 0, "ancho": 2, "cantidad": 3,
+                                "ventana": 120, "caida": 30, "carga_minima": 60}},
+    "apagado": {"fuentes": ("gpu",), "construir": "_construir_panel_apagado",
+                "desmontar": "_desmontar_panel_apagado",
+                "por_defecto": {"activo": True, "fila": 6, "columna": 0, "ancho": 2}},
+}
+
+# Métricas que puede vigilar el panel de picos y la fuente que las produce
+CATALOGO_METRICAS = {
+    "cpu": {"nombre": "CPU", "fuente": "cpu"},
+    "gpu": {"nombre": "GPU (Uso)", "fuente": "gpu"},
+    "vram": {"nombre": "VRAM", "fuente": "gpu"},
+    "ram": {"nombre": "RAM", "fuente": "ram"},
+}
+
+CONFIG_POR_DEFECTO = {
+    "fuentes": {fuente: info["intervalo"] for fuente, info in CATALOGO_FUENTES.items()},
+    "graficas": {
+        "fps_max": 10,  # Límite global de repintado de todas las gráficas
+    },
+    "paneles": {panel_id: info["por_defecto"] for panel_id, info in CATALOGO_PANELES.items()},
+}
+
+def ruta_config():
+    """ Devuelve la ruta del JSON de configuración (junto al .py o al .exe). """
+    if getattr(sys, 'frozen', False):
+        base = os.path.dirname(sys.executable)
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, "dashboard_config.json")
+
+# --- Validación de la configuración (cada función lanza ValueError) ---
+def _objeto(valor, ruta):
+    if not isinstance(valor, dict):
+        raise ValueError(f"{ruta} debe ser un objeto JSON")
+    return valor
+
+def _booleano(valor, ruta):
+    if not isinstance(valor, bool):
+        raise ValueError(f"{ruta} debe ser true o false")
+
+def _entero(valor, ruta, minimo=0):
+    if isinstance(valor, bool) or not isinstance(valor, int):
+        raise ValueError(f"{ruta} debe ser un número entero")
+    if valor < minimo:
+        raise ValueError(f"{ruta} debe ser >= {minimo}")
+
+def _numero(valor, ruta):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"{ruta} debe ser un número")
+
+def _positivo(valor, ruta):
+    _numero(valor, ruta)
+    if valor <= 0:
+        raise ValueError(f"{ruta} debe ser mayor que 0")
+
+def _porcentaje(valor, ruta):
+    _numero(valor, ruta)
+    if not 0 <= valor <= 100:
+        raise ValueError(f"{ruta} debe estar entre 0 y 100")
+
+def _umbrales(valor, ruta):
+    if not isinstance(valor, list) or len(valor) != 2:
+        raise ValueError(f"{ruta} debe ser una lista [aviso, crítico]")
+    _numero(valor[0], ruta)
+    _numero(valor[1], ruta)
+    if valor[0] > valor[1]:
+        raise ValueError(f"{ruta}: el aviso no puede ser mayor que el crítico")
+
+def _grafica(valor, ruta):
+    if valor is None:
+        return # Sin gráfica
+    _objeto(valor, ruta)
+    _entero(valor["columna"], f"{ruta}.columna")
+    _entero(valor["puntos"], f"{ruta}.puntos", minimo=2)
+    if not isinstance(valor["color"], str):
+        raise ValueError(f"{ruta}.color debe ser un texto")
+    try:
+        pg.mkColor(valor["color"])
+    except Exception:
+        raise ValueError(f"{ruta}.color no es un color válido: {valor['color']!r}")
+
+def _metricas(valor, ruta):
+    if not isinstance(valor, list) or any(m not in CATALOGO_METRICAS for m in valor):
+        raise ValueError(f"{ruta} debe ser una lista con métricas de {sorted(CATALOGO_METRICAS)}")
+
+VALIDADORES_PANEL = {
+    "activo": _booleano,
+    "fila": _entero,
+    "columna": _entero,
+    "ancho": lambda v, r: _entero(v, r, minimo=1),
+    "umbrales": _umbrales,
+    "grafica": _grafica,
+    "metricas": _metricas,
+    "pico": _numero,
+    "rearme": _numero,
+    "cantidad": lambda v, r: _entero(v, r, minimo=1),
+    "ventana": lambda v, r: _entero(v, r, minimo=10), # Muestras mínimas de la línea base del detector
+    "caida": _positivo,
+    "carga_minima": _porcentaje,
+}
+
+def cargar_config(ruta):
+    """ Lee el JSON de configuración y lo combina con CONFIG_POR_DEFECTO.
+    Lanza OSError o ValueError si el archivo existe pero no se puede leer
+    o no es válido. """
+    config = copy.deepcopy(CONFIG_POR_DEFECTO)
+    if not os.path.exists(ruta):
+        return config
+
+    with open(ruta, encoding='utf-8') as f:
+        datos = _objeto(json.load(f), "configuración")
+
+    for fuente, intervalo in _objeto(datos.get("fuentes", {}), "fuentes").items():
+        if fuente not in config["fuentes"]:
+            print(f"Fuente desconocida en la configuración: {fuente}")
+            continue
+        _entero(intervalo, f"fuentes.{fuente}", minimo=100)
+        config["fuentes"][fuente] = intervalo
+
+    for clave, valor in _objeto(datos.get("graficas", {}), "graficas").items():
+        if clave != "fps_max":
+            print(f"Opción desconocida en la configuración: graficas.{clave}")
+            continue
+        _entero(valor, "graficas.fps_max", minimo=1)
+        config["graficas"][clave] = valor
+
+    for panel_id, valores in _objeto(datos.get("paneles", {}), "paneles").items():
+        if panel_id not in config["paneles"]:
+            print(f"Panel desconocido en la configuración: {panel_id}")
+            continue
+        panel = config["paneles"][panel_id]
+        for clave, valor in _objeto(valores, f"paneles.{panel_id}").items():
+            if clave not in panel:
+                print(f"Opción desconocida en la configuración: paneles.{panel_id}.{clave}")
+                continue
+            if isinstance(valor, dict) and isinstance(panel.get(clave), dict):
+                panel[clave].update(valor)
+            else:
+                panel[clave] = valor # Ej: "grafica": null quita la gráfica
+
+    # Validar el resultado combinado: así también se comprueban los dicts parciales
+    for panel_id, panel in config["paneles"].items():
+        for clave, valor in panel.items():
+            try:
+                VALIDADORES_PANEL[clave](valor, f"paneles.{panel_id}.{clave}")
+            except (KeyError, TypeError):
+                raise ValueError(f"paneles.{panel_id}.{clave} tiene un formato no válido")
+        if "pico" in panel and panel["rearme"] > panel["pico"]:
+            raise ValueError(f"paneles.{panel_id}.rearme no puede ser mayor que pico")
+    return config
@@ -1,13 +1,19 @@
 import sys
 import psutil
 from pynvml import *
-import pyqtgraph as pg
 import wmi
 import os
+import copy
+import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QLabel, QProgressBar, QGridLayout, QGroupBox, QFrame,
                              QCheckBox, QScrollArea)
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QTimer, Qt, QFileSystemWatcher
+
+from configuracion import (CATALOGO_FUENTES, CATALOGO_PANELES, CATALOGO_METRICAS,
+                           CONFIG_POR_DEFECTO, cargar_config, ruta_config)
+from detector_tirones import DetectorTirones, describir_anomalia
+from graficas import GraficaHistorial, MotorGraficas
 
 # --- ESTILOS (QSS) ---
 DARK_MODE_STYLESHEET = """
@@ -71,35 +77,185 @@ class MonitorDashboard(QMainWindow):
 
         self.shutdown_armed = False
         self.idle_counter = 0
-
-        # --- Contadores y banderas para Picos ---
         self.cpu_count = psutil.cpu_count()
-        self.cpu_high_flag = False
-        self.gpu_high_flag = False
-        self.vram_high_flag = False
-        self.ram_high_flag = False
-        self.cpu_peak_count = 0
-        self.gpu_peak_count = 0
-        self.vram_peak_count = 0
-        self.ram_peak_count = 0
+
+        # --- Contadores y banderas para Picos (sobreviven a recargas) ---
+        self.picos = {m: {'count': 0, 'high_flag': False} for m in CATALOGO_METRICAS}
 
         self.drag_timer = QTimer(self)
         self.drag_timer.setSingleShot(True)
         self.drag_timer.timeout.connect(self.resume_updates)
 
-        # --- Cache de últimos valores ---
-        self.last_cpu_percent = -1
-        self.last_cpu_ghz = -1.0
-        self.last_gpu_temp = -1
-        self.last_gpu_util = -1
-        self.last_gpu_fan = -1
-        self.last_vram_percent = -1
-        self.last_gpu_clock = -1
-        self.last_gpu_power = -1
-        self.last_ram_percent = -1
-        self.last_net_down = -1.0
-        self.last_net_up = -1.0
+        # --- Estado de fuentes y paneles ---
+        # Cada panel guarda sus widgets y su cache de últimos valores en un dict
+        self.paneles = {}
+        self.timers = {}
+        self.fuentes_preparadas = set()
+        self.muestreadores = {fuente: getattr(self, info["muestrear"])
+                              for fuente, info in CATALOGO_FUENTES.items()}
+        self.gpu_handle = None
+        self.gpu_name_str = "NVIDIA GPU"
+        self.wmi_c = None
+        self.drive_info_map = {}
+        self.physical_drives_psutil = []
+        self.top_procesos = []
+
+        # --- Cargar configuración ---
+        self.config_path = ruta_config()
+        try:
+            config = cargar_config(self.config_path)
+        except (OSError, ValueError) as e:
+            print(f"Error leyendo {self.config_path}, usando valores por defecto: {e}")
+            config = copy.deepcopy(CONFIG_POR_DEFECTO)
+        self.config = {"fuentes": {}, "paneles": {}, "graficas": {}}
 
+        # Todas las gráficas se vuelcan juntas, con límite de FPS y solo si se ven
+        self.motor_graficas = MotorGraficas(parent=self)
+
+        self.setStyleSheet(DARK_MODE_STYLESHEET)
+        self.initUI()
+        self.aplicar_config(config)
+
+        # --- Recarga en caliente del archivo de configuración ---
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.timeout.connect(self.recargar_config)
+        # Se vigila también el directorio: así se detecta el archivo si se crea
+        # después de arrancar o si un editor lo borra y lo vuelve a escribir
+        self.config_watcher = QFileSystemWatcher(self)
+        self.config_watcher.addPath(os.path.dirname(self.config_path))
+        if os.path.exists(self.config_path):
+            self.config_watcher.addPath(self.config_path)
+        self.config_watcher.fileChanged.connect(lambda _: self.reload_timer.start(300))
+        self.config_watcher.directoryChanged.connect(lambda _: self.reload_timer.start(300))
+
+    def moveEvent(self, event):
+        """ Se llama CADA VEZ que la ventana se mueve. """
+        for timer in self.timers.values():
+            timer.stop()
+        self.drag_timer.start(250)
+        super().moveEvent(event)
+
+    def resume_updates(self):
+        """ Se llama 250ms después de que la ventana DEJA de moverse. """
+        for fuente, timer in self.timers.items():
+            if not timer.isActive():
+                self.muestreadores[fuente]()
+                timer.start(self.config["fuentes"][fuente])
+
+    def prime_processes(self):
+        """ Llama a cpu_percent(None) en todos los procesos para "cebarlos". """
+        for p in psutil.process_iter():
+            try:
+                p.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+
+    # --- Configuración y recarga en caliente ---
+    def recargar_config(self):
+        """ Relee el JSON tras un cambio en disco y aplica solo las diferencias. """
+        # Si el archivo ha desaparecido (p. ej. un editor lo está reescribiendo)
+        # se mantiene la configuración actual, no la de por defecto
+        if not os.path.exists(self.config_path):
+            return
+        # Algunos editores reemplazan el archivo y el watcher lo pierde
+        if self.config_path not in self.config_watcher.files():
+            self.config_watcher.addPath(self.config_path)
+        try:
+            config = cargar_config(self.config_path)
+        except (OSError, ValueError) as e:
+            print(f"Configuración no válida, se mantiene la actual: {e}")
+            return
+        if config == self.config:
+            return # Ha cambiado otro archivo del directorio
+        print("Configuración recargada.")
+        self.aplicar_config(config)
+
+    def fuentes_de_panel(self, panel_id, panel_cfg):
+        fuentes = set(CATALOGO_PANELES[panel_id]['fuentes'])
+        fuentes |= {CATALOGO_METRICAS[m]['fuente'] for m in panel_cfg.get('metricas', ())}
+        return fuentes
+
+    def aplicar_config(self, config):
+        """ Reconstruye solo los paneles cuya configuración ha cambiado y
+        arranca, para o reajusta solo las fuentes afectadas. """
+        antigua = self.config
+
+        activos = {pid: cfg for pid, cfg in config["paneles"].items() if cfg.get("activo", True)}
+        self.motor_graficas.ajustar_fps(config["graficas"]["fps_max"])
+
+        # 1. Quitar los paneles desactivados y los que cambian de estructura.
+        #    Umbrales y colores se aplican sin reconstruir nada.
+        historiales = {}
+        for panel_id in list(self.paneles):
+            nueva = activos.get(panel_id)
+            if nueva == self.paneles[panel_id]['config']:
+                continue
+            actualizado = False
+            if nueva is not None:
+                try:
+                    actualizado = self.actualizar_panel(panel_id, nueva, config["fuentes"])
+                except Exception as e:
+                    # El panel sigue con su configuración anterior: se reconstruye entero
+                    print(f"Error actualizando el panel {panel_id}: {e}")
+            if not actualizado:
+                historiales[panel_id] = self.paneles[panel_id].get('plot_curve')
+                self.destruir_panel(panel_id)
+
+        # 2. Preparar las fuentes necesarias (la GPU y los discos hacen falta para construir)
+        necesarias = set()
+        for panel_id, cfg in activos.items():
+            necesarias |= self.fuentes_de_panel(panel_id, cfg)
+        for fuente in necesarias:
+            self.preparar_fuente(fuente)
+
+        # 3. Construir los paneles nuevos o modificados
+        for panel_id, cfg in activos.items():
+            if panel_id not in self.paneles:
+                try:
+                    self.construir_panel(panel_id, cfg, config["fuentes"], historiales.get(panel_id))
+                except Exception as e:
+                    # No se registra: se reintentará en la próxima recarga
+                    print(f"Error construyendo el panel {panel_id}: {e}")
+
+        # 4. Ajustar temporizadores
+        for fuente in list(self.timers):
+            if fuente not in necesarias:
+                self.timers.pop(fuente).deleteLater()
+        for fuente in necesarias:
+            intervalo = config["fuentes"][fuente]
+            if fuente not in self.timers:
+                timer = QTimer(self)
+                timer.timeout.connect(self.muestreadores[fuente])
+                timer.start(intervalo)
+                self.timers[fuente] = timer
+            elif antigua["fuentes"].get(fuente) != intervalo:
+                self.timers[fuente].start(intervalo)
+                self.actualizar_titulos_graficas(fuente, intervalo)
+
+        # La última fila absorbe el espacio sobrante
+        self.main_layout.setRowStretch(self.stretch_row, 0)
+        self.stretch_row = max((cfg["fila"] for cfg in activos.values()), default=-1) + 1
+        self.main_layout.setRowStretch(self.stretch_row, 1)
+
+        # Solo ahora, con todo aplicado, pasa a ser la configuración actual
+        self.config = config
+
+    def preparar_fuente(self, fuente):
+        """ Inicialización perezosa: una fuente que nunca se usa no cuesta nada. """
+        info = CATALOGO_FUENTES[fuente]
+        if fuente in self.fuentes_preparadas:
+            # Los contadores acumulados se reinician al volver a usarse
+            if info.get("reiniciar") and fuente not in self.timers:
+                getattr(self, info["reiniciar"])()
+            return
+        for previa in info.get("requiere", ()):
+            self.preparar_fuente(previa)
+        if info.get("preparar"):
+            getattr(self, info["preparar"])()
+        self.fuentes_preparadas.add(fuente)
+
+    def preparar_gpu(self):
         # --- Inicializar NVIDIA NVML ---
         try:
             nvmlInit()
@@ -113,15 +269,26 @@ class MonitorDashboard(QMainWindow):
             self.gpu_handle = None
             self.gpu_name_str = "NVIDIA GPU (Error)"
 
+    def preparar_red(self):
         # --- Inicializar contadores de Red ---
         net_io = psutil.net_io_counters()
         self.last_bytes_sent = net_io.bytes_sent
         self.last_bytes_recv = net_io.bytes_recv
+        self.last_net_time = time.monotonic()
 
+    def preparar_tirones(self):
+        # --- Contadores propios del muestreo rápido ---
+        psutil.cpu_percent(percpu=True) # Cebar el uso por núcleo
+        self.last_hitch_disk_io = psutil.disk_io_counters(perdisk=True)
+        self.last_hitch_time = time.monotonic()
+
+    def reiniciar_discos(self):
+        self.last_disk_io = psutil.disk_io_counters(perdisk=True)
+        self.last_disk_time = time.monotonic()
+
+    def preparar_discos(self):
         # --- Detectar discos con PSUTIL y WMI ---
-        self.disk_widgets = {}
-        self.drive_info_map = {}
-        self.physical_drives_psutil = []
+        self.last_disk_time = time.monotonic()
         try:
             self.last_disk_io = psutil.disk_io_counters(perdisk=True)
             self.physical_drives_psutil = list(self.last_disk_io.keys())
@@ -173,134 +340,198 @@ class MonitorDashboard(QMainWindow):
                     # Rellenar sin datos de WMI
                     self.drive_info_map[name] = {'index': '?', 'letters': name, 'type': '?', 'perfmon_name': None}
 
-
-        self.prime_processes()
-
-        # --- Datos para las gráficas (60s) ---
-        self.plot_data_points = 60
-        self.cpu_plot_data = [0] * self.plot_data_points
-        self.gpu_plot_data = [0] * self.plot_data_points
-        self.ram_plot_data = [0] * self.plot_data_points
-
-        self.setStyleSheet(DARK_MODE_STYLESHEET)
-        self.initUI()
-
-        # --- Timer principal (1 segundo) ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.actualizar_datos)
-        self.timer.start(1000)
-
-        # --- Timer para Top Procesos (3 segundos) ---
-        self.proc_timer = QTimer(self)
-        self.proc_timer.timeout.connect(self.actualizar_top_procesos)
-        self.proc_timer.start(3000) 
-        self.actualizar_top_procesos() 
-
-    def moveEvent(self, event):
-        """ Se llama CADA VEZ que la ventana se mueve. """
-        self.timer.stop()
-        self.proc_timer.stop() 
-        self.drag_timer.start(250)
-        super().moveEvent(event)
-
-    def resume_updates(self):
-        """ Se llama 250ms después de que la ventana DEJA de moverse. """
-        if not self.timer.isActive():
-            self.actualizar_datos()
-            self.actualizar_top_procesos() 
-            self.timer.start(1000)
-            self.proc_timer.start(3000) 
-
-    def prime_processes(self):
-        """ Llama a cpu_percent(None) en todos los procesos para "cebarlos". """
-        for p in psutil.process_iter():
-            try:
-                p.cpu_percent(interval=None)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-
-    def _crear_plot_widget(self, title):
-        plot_widget = pg.PlotWidget()
-        plot_widget.setTitle(title)
-        plot_widget.setYRange(0, 100)
-        plot_widget.getAxis('bottom').setTicks([])
-        plot_widget.getAxis('left').setPen(None)
-        plot_widget.setBackground(None)
-        return plot_widget
-
+    # --- Construcción de la interfaz ---
     def initUI(self):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setCentralWidget(self.scroll_area)
+        # Las gráficas que vuelven a la vista se ponen al día
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.motor_graficas.solicitar)
 
         scroll_content_widget = QWidget()
         scroll_content_widget.setObjectName("scroll_content")
 
-        main_layout = QGridLayout(scroll_content_widget)
+        self.main_layout = QGridLayout(scroll_content_widget)
+
+        self.main_layout.setColumnStretch(0, 1) # Columna izquierda
+        self.main_layout.setColumnStretch(1, 1) # Columna derecha
+        self.stretch_row = 0
 
-        main_layout.setColumnStretch(0, 1) # Columna izquierda
-        main_layout.setColumnStretch(1, 1) # Columna derecha
+        # Los paneles se añaden desde aplicar_config()
+        self.scroll_area.setWidget(scroll_content_widget)
 
-        # --- CPU (Fila 0) ---
+    def construir_panel(self, panel_id, cfg, fuentes, historial_previo=None):
+        """ Construye el panel y solo lo registra si se ha construido entero. """
+        panel = {'config': cfg, 'fuentes': fuentes, 'contenedores': [], 'barras': [],
+                 'historial_previo': historial_previo}
+        try:
+            getattr(self, CATALOGO_PANELES[panel_id]["construir"])(panel, cfg)
+        except Exception:
+            self._quitar_widgets(panel)
+            raise
+        self.paneles[panel_id] = panel
+
+    def destruir_panel(self, panel_id):
+        panel = self.paneles.pop(panel_id)
+        self._quitar_widgets(panel)
+        desmontar = CATALOGO_PANELES[panel_id].get("desmontar")
+        if desmontar:
+            getattr(self, desmontar)(panel)
+
+    def actualizar_panel(self, panel_id, cfg, fuentes):
+        """ Aplica en sitio los cambios que no afectan a la estructura del panel:
+        umbrales (se recolorean las barras) y gráfica (cambio de color con
+        setPen; otro 'puntos' o 'columna' solo recrea la gráfica, conservando
+        el historial). Devuelve False si hay que reconstruir el panel entero. """
+        panel = self.paneles[panel_id]
+        vieja = panel['config']
+        resto = lambda c: {k: v for k, v in c.items() if k not in ('umbrales', 'grafica')}
+        if resto(vieja) != resto(cfg):
+            return False
+
+        # La configuración del panel solo se sustituye si todo lo anterior ha ido bien
+        grafica_vieja, grafica_nueva = vieja.get('grafica'), cfg.get('grafica')
+        if grafica_vieja == grafica_nueva:
+            pass
+        elif grafica_vieja and grafica_nueva and \
+                {**grafica_vieja, 'color': None} == {**grafica_nueva, 'color': None}:
+            panel['plot_curve'].item.setPen(grafica_nueva['color'])
+        else:
+            # Cambian 'puntos' o 'columna' (o se añade/quita la gráfica): solo se recrea ella
+            self._recrear_grafica(panel, cfg, fuentes)
+
+        if vieja.get('umbrales') != cfg.get('umbrales'):
+            for barra in panel['barras']:
+                self.actualizar_estilo_barra_uso(barra, max(barra.value(), 0), cfg['umbrales'])
+        panel['config'] = cfg
+        panel['fuentes'] = fuentes
+        return True
+
+    def _recrear_grafica(self, panel, cfg, fuentes):
+        """ Sustituye la gráfica del panel; si la nueva falla, se queda la anterior. """
+        anterior = {clave: panel.pop(clave) for clave in ('plot', 'plot_curve') if clave in panel}
+        panel['historial_previo'] = anterior.get('plot_curve')
+        nombre, fuente = panel['plot_info']
+        try:
+            self._crear_grafica(panel, nombre, fuente, cfg, fuentes)
+        except Exception:
+            nueva = panel.pop('plot', None)
+            if nueva is not None:
+                self.motor_graficas.eliminar(nueva)
+                nueva.deleteLater()
+            panel.pop('plot_curve', None)
+            panel.update(anterior)
+            raise
+        plot = anterior.get('plot')
+        if plot is not None:
+            self.motor_graficas.eliminar(plot)
+            panel['contenedores'].remove(plot)
+            self.main_layout.removeWidget(plot)
+            plot.deleteLater()
+
+    def _quitar_widgets(self, panel):
+        if 'plot' in panel:
+            self.motor_graficas.eliminar(panel['plot'])
+        for widget in panel['contenedores']:
+            self.main_layout.removeWidget(widget)
+            widget.deleteLater()
+
+    def _colocar(self, panel, widget, columna, ancho=1):
+        self.main_layout.addWidget(widget, panel['config']['fila'], columna, 1, ancho)
+        panel['contenedores'].append(widget)
+
+    def _titulo_grafica(self, nombre, intervalo, puntos):
+        segundos = puntos * intervalo / 1000
+        return f"Historial Uso {nombre} ({segundos:g}s)"
+
+    def _crear_grafica(self, panel, nombre, fuente, cfg=None, fuentes=None):
+        """ Añade la gráfica de historial del panel si la configuración la pide
+        (la del panel salvo que se pase otra). Si el panel se está recreando,
+        la curva nueva hereda el historial anterior. """
+        cfg = cfg or panel['config']
+        fuentes = fuentes or panel['fuentes']
+        panel['plot_info'] = (nombre, fuente)
+        historial = panel.pop('historial_previo', None)
+        grafica = cfg.get('grafica')
+        if not grafica:
+            return
+        titulo = self._titulo_grafica(nombre, fuentes[fuente], grafica['puntos'])
+        panel['plot'] = GraficaHistorial(titulo, grafica['puntos'], self.motor_graficas)
+        panel['plot_curve'] = panel['plot'].añadir_curva(grafica['color'])
+        if historial is not None:
+            panel['plot_curve'].copiar_historial(historial)
+        self._colocar(panel, panel['plot'], grafica['columna'])
+
+    def actualizar_titulos_graficas(self, fuente, intervalo):
+        """ La ventana en segundos depende del intervalo: se retitula sin reconstruir. """
+        for panel in self.paneles.values():
+            if 'plot' in panel and panel['plot_info'][1] == fuente:
+                nombre = panel['plot_info'][0]
+                panel['plot'].setTitle(self._titulo_grafica(nombre, intervalo, panel['plot'].capacidad))
+
+    def _construir_panel_cpu(self, panel, cfg):
         cpu_stats_group = QGroupBox("CPU")
         cpu_layout = QVBoxLayout()
         cpu_grid = QGridLayout()
-        self.cpu_usage_label = QLabel("Uso: 0%")
-        self.cpu_clock_label = QLabel("Reloj: 0.00 GHz")
-        cpu_grid.addWidget(self.cpu_usage_label, 0, 0)
-        cpu_grid.addWidget(self.cpu_clock_label, 0, 1)
+        panel['usage_label'] = QLabel("Uso: 0%")
+        panel['clock_label'] = QLabel("Reloj: 0.00 GHz")
+        cpu_grid.addWidget(panel['usage_label'], 0, 0)
+        cpu_grid.addWidget(panel['clock_label'], 0, 1)
         cpu_layout.addLayout(cpu_grid)
-        self.cpu_usage_bar = QProgressBar()
-        cpu_layout.addWidget(self.cpu_usage_bar)
+        panel['usage_bar'] = QProgressBar()
+        panel['barras'].append(panel['usage_bar'])
+        cpu_layout.addWidget(panel['usage_bar'])
         cpu_stats_group.setLayout(cpu_layout)
-        self.cpu_plot = self._crear_plot_widget("Historial Uso CPU (60s)")
-        self.cpu_plot_curve = self.cpu_plot.plot(self.cpu_plot_data, pen='c')
-        main_layout.addWidget(cpu_stats_group, 0, 0)
-        main_layout.addWidget(self.cpu_plot, 0, 1)
+        panel['last_percent'] = -1
+        panel['last_ghz'] = -1.0
+        self._colocar(panel, cpu_stats_group, cfg['columna'], cfg.get('ancho', 1))
+        self._crear_grafica(panel, "CPU", 'cpu')
 
-        # --- GPU (Fila 1) ---
+    def _construir_panel_gpu(self, panel, cfg):
         gpu_stats_group = QGroupBox(f"GPU: {self.gpu_name_str}")
         gpu_layout = QVBoxLayout()
         gpu_grid = QGridLayout()
-        self.gpu_temp_label = QLabel("Temp: 0°C")
-        self.gpu_usage_label = QLabel("Uso: 0%")
-        self.gpu_fan_label = QLabel("Fan: 0%")
-        self.gpu_vram_label = QLabel("VRAM: 0%")
-        self.gpu_clock_label = QLabel("Reloj: 0 MHz")
-        self.gpu_power_label = QLabel("Consumo: 0 W")
-        gpu_grid.addWidget(self.gpu_temp_label, 0, 0)
-        gpu_grid.addWidget(self.gpu_usage_label, 0, 1)
-        gpu_grid.addWidget(self.gpu_fan_label, 1, 0)
-        gpu_grid.addWidget(self.gpu_vram_label, 1, 1)
-        gpu_grid.addWidget(self.gpu_clock_label, 2, 0)
-        gpu_grid.addWidget(self.gpu_power_label, 2, 1)
+        panel['temp_label'] = QLabel("Temp: 0°C")
+        panel['usage_label'] = QLabel("Uso: 0%")
+        panel['fan_label'] = QLabel("Fan: 0%")
+        panel['vram_label'] = QLabel("VRAM: 0%")
+        panel['clock_label'] = QLabel("Reloj: 0 MHz")
+        panel['power_label'] = QLabel("Consumo: 0 W")
+        gpu_grid.addWidget(panel['temp_label'], 0, 0)
+        gpu_grid.addWidget(panel['usage_label'], 0, 1)
+        gpu_grid.addWidget(panel['fan_label'], 1, 0)
+        gpu_grid.addWidget(panel['vram_label'], 1, 1)
+        gpu_grid.addWidget(panel['clock_label'], 2, 0)
+        gpu_grid.addWidget(panel['power_label'], 2, 1)
         gpu_layout.addLayout(gpu_grid)
-        self.gpu_vram_bar = QProgressBar()
-        self.gpu_vram_bar.setRange(0, 100)
-        gpu_layout.addWidget(self.gpu_vram_bar)
+        panel['vram_bar'] = QProgressBar()
+        panel['vram_bar'].setRange(0, 100)
+        panel['barras'].append(panel['vram_bar'])
+        gpu_layout.addWidget(panel['vram_bar'])
         gpu_stats_group.setLayout(gpu_layout)
-        self.gpu_plot = self._crear_plot_widget("Historial Uso GPU (60s)")
-        self.gpu_plot_curve = self.gpu_plot.plot(self.gpu_plot_data, pen='#FFB84C')
-        main_layout.addWidget(gpu_stats_group, 1, 0)
-        main_layout.addWidget(self.gpu_plot, 1, 1)
+        for clave in ('last_temp', 'last_util', 'last_fan', 'last_vram_percent', 'last_clock', 'last_power'):
+            panel[clave] = -1
+        self._colocar(panel, gpu_stats_group, cfg['columna'], cfg.get('ancho', 1))
+        self._crear_grafica(panel, "GPU", 'gpu')
 
-        # --- RAM (Fila 2) ---
+    def _construir_panel_ram(self, panel, cfg):
         ram_stats_group = QGroupBox("RAM")
         ram_layout = QVBoxLayout()
-        self.ram_usage_label = QLabel("RAM: 0%")
-        self.ram_usage_bar = QProgressBar()
-        ram_layout.addWidget(self.ram_usage_label)
-        ram_layout.addWidget(self.ram_usage_bar)
+        panel['usage_label'] = QLabel("RAM: 0%")
+        panel['usage_bar'] = QProgressBar()
+        panel['barras'].append(panel['usage_bar'])
+        ram_layout.addWidget(panel['usage_label'])
+        ram_layout.addWidget(panel['usage_bar'])
         ram_stats_group.setLayout(ram_layout)
-        self.ram_plot = self._crear_plot_widget("Historial Uso RAM (60s)")
-        self.ram_plot_curve = self.ram_plot.plot(self.ram_plot_data, pen='#4CFFB8')
-        main_layout.addWidget(ram_stats_group, 2, 0)
-        main_layout.addWidget(self.ram_plot, 2, 1)
+        panel['last_percent'] = -1
+        self._colocar(panel, ram_stats_group, cfg['columna'], cfg.get('ancho', 1))
+        self._crear_grafica(panel, "RAM", 'ram')
 
-        # --- Discos ---
+    def _construir_panel_discos(self, panel, cfg):
         disk_stats_group = QGroupBox("Unidades (Actividad y Velocidad)")
-        self.disk_layout = QVBoxLayout()
+        disk_layout = QVBoxLayout()
+        panel['unidades'] = {}
         for drive_name in self.physical_drives_psutil:
             if drive_name in self.drive_info_map:
                 info = self.drive_info_map[drive_name]
@@ -321,12 +552,13 @@ class MonitorDashboard(QMainWindow):
                 disk_grid.addWidget(disk_write_label, 0, 2)
 
                 disk_bar = QProgressBar()
+                panel['barras'].append(disk_bar)
                 disk_grid.addWidget(disk_bar, 1, 0, 1, 3) 
 
-                self.disk_layout.addLayout(disk_grid)
+                disk_layout.addLayout(disk_grid)
 
                 # Guardamos referencias
-                self.disk_widgets[drive_name] = {
+                panel['unidades'][drive_name] = {
                     'label': disk_label, 'bar': disk_bar,
                     'read_label': disk_read_label, 'write_label': disk_write_label,
                     'info': info,
@@ -334,94 +566,104 @@ class MonitorDashboard(QMainWindow):
                     'last_read_mb_s': -1.0,
                     'last_write_mb_s': -1.0
                 }
-        disk_stats_group.setLayout(self.disk_layout)
-        main_layout.addWidget(disk_stats_group, 3, 0) 
-        # --- FIN Discos ---
+        disk_stats_group.setLayout(disk_layout)
+        self._colocar(panel, disk_stats_group, cfg['columna'], cfg.get('ancho', 1))
 
-        # --- Contador de Picos (Fila 3, Columna 1) ---
-        peak_group = QGroupBox("Historial de Picos (+95%)")
+    def _construir_panel_picos(self, panel, cfg):
+        peak_group = QGroupBox(f"Historial de Picos (+{cfg['pico']}%)")
         peak_layout = QVBoxLayout()
-        self.cpu_peak_label = QLabel("CPU: Nunca")
-        self.gpu_peak_label = QLabel("GPU (Uso): Nunca")
-        self.vram_peak_label = QLabel("VRAM: Nunca")
-        self.ram_peak_label = QLabel("RAM: Nunca")
-        self.cpu_peak_label.setObjectName("peak_label")
-        self.gpu_peak_label.setObjectName("peak_label")
-        self.vram_peak_label.setObjectName("peak_label")
-        self.ram_peak_label.setObjectName("peak_label")
-        peak_layout.addWidget(self.cpu_peak_label)
-        peak_layout.addWidget(self.gpu_peak_label)
-        peak_layout.addWidget(self.vram_peak_label)
-        peak_layout.addWidget(self.ram_peak_label)
+        panel['labels'] = {}
+        for metrica in cfg['metricas']:
+            label = QLabel()
+            label.setObjectName("peak_label")
+            panel['labels'][metrica] = label
+            self._texto_pico(metrica, label)
+            peak_layout.addWidget(label)
         peak_layout.addStretch()
         peak_group.setLayout(peak_layout)
-        main_layout.addWidget(peak_group, 3, 1)
+        self._colocar(panel, peak_group, cfg['columna'], cfg.get('ancho', 1))
 
-        # --- Red (Fila 4, Columna 0) ---
+    def _construir_panel_red(self, panel, cfg):
         net_stats_group = QGroupBox("Red")
         net_layout = QVBoxLayout()
-        self.net_down_label = QLabel("Descarga: 0.00 MB/s")
-        self.net_up_label = QLabel("Subida: 0.00 MB/s")
-        net_layout.addWidget(self.net_down_label)
-        net_layout.addWidget(self.net_up_label)
+        panel['down_label'] = QLabel("Descarga: 0.00 MB/s")
+        panel['up_label'] = QLabel("Subida: 0.00 MB/s")
+        net_layout.addWidget(panel['down_label'])
+        net_layout.addWidget(panel['up_label'])
         net_layout.addStretch()
         net_stats_group.setLayout(net_layout)
-        main_layout.addWidget(net_stats_group, 4, 0) 
+        panel['last_down'] = -1.0
+        panel['last_up'] = -1.0
+        self._colocar(panel, net_stats_group, cfg['columna'], cfg.get('ancho', 1))
 
-        # --- Top Procesos (Fila 4, Columna 1) ---
+    def _construir_panel_procesos(self, panel, cfg):
         top_proc_group = QGroupBox("Top Procesos CPU")
         top_proc_layout = QVBoxLayout()
-        self.top_proc_1 = QLabel("1. ...")
-        self.top_proc_2 = QLabel("2. ...")
-        self.top_proc_3 = QLabel("3. ...")
-        self.top_proc_1.setObjectName("top_proc_label")
-        self.top_proc_2.setObjectName("top_proc_label")
-        self.top_proc_3.setObjectName("top_proc_label")
-        top_proc_layout.addWidget(self.top_proc_1)
-        top_proc_layout.addWidget(self.top_proc_2)
-        top_proc_layout.addWidget(self.top_proc_3)
+        panel['labels'] = []
+        for i in range(cfg['cantidad']):
+            label = QLabel(f"{i+1}. ...")
+            label.setObjectName("top_proc_label")
+            top_proc_layout.addWidget(label)
+            panel['labels'].append(label)
         top_proc_layout.addStretch()
         top_proc_group.setLayout(top_proc_layout)
-        main_layout.addWidget(top_proc_group, 4, 1)
-
-        # --- Apagado (Fila 5) ---
+        self._colocar(panel, top_proc_group, cfg['columna'], cfg.get('ancho', 1))
+
+    def _construir_panel_tirones(self, panel, cfg):
+        hitch_group = QGroupBox("Detector de Tirones (caídas de GPU)")
+        hitch_layout = QVBoxLayout()
+        panel['detector'] = DetectorTirones(ventana=cfg['ventana'], caida=cfg['caida'],
+                                            carga_minima=cfg['carga_minima'],
+                                            max_informes=cfg['cantidad'])
+        panel['labels'] = []
+        for i in range(cfg['cantidad']):
+            label = QLabel("Sin tirones detectados" if i == 0 else "")
+            label.setObjectName("top_proc_label")
+            label.setWordWrap(True)
+            hitch_layout.addWidget(label)
+            panel['labels'].append(label)
+        hitch_group.setLayout(hitch_layout)
+        self._colocar(panel, hitch_group, cfg['columna'], cfg.get('ancho', 1))
+
+    def _construir_panel_apagado(self, panel, cfg):
         shutdown_group = QGroupBox("Apagado Automático")
         shutdown_layout = QVBoxLayout()
-        self.shutdown_checkbox = QCheckBox("Apagar si GPU está fría (<50°C) y en reposo (<10%) durante 1 minuto")
-        self.shutdown_checkbox.toggled.connect(self.toggle_shutdown)
-        self.shutdown_status_label = QLabel("Apagado: DESACTIVADO")
-        self.shutdown_status_label.setObjectName("shutdown_status")
-        shutdown_layout.addWidget(self.shutdown_checkbox)
-        shutdown_layout.addWidget(self.shutdown_status_label)
+        panel['checkbox'] = QCheckBox("Apagar si GPU está fría (<50°C) y en reposo (<10%) durante 1 minuto")
+        panel['checkbox'].toggled.connect(self.toggle_shutdown)
+        panel['status_label'] = QLabel("Apagado: DESACTIVADO")
+        panel['status_label'].setObjectName("shutdown_status")
+        shutdown_layout.addWidget(panel['checkbox'])
+        shutdown_layout.addWidget(panel['status_label'])
         shutdown_group.setLayout(shutdown_layout)
-        main_layout.addWidget(shutdown_group, 5, 0, 1, 2) 
-
-        # --- Ajustar estiramiento ---
-        main_layout.setRowStretch(3, 0)
-        main_layout.setRowStretch(4, 0)
-        main_layout.setRowStretch(5, 0)
-        main_layout.setRowStretch(6, 1)
+        self._colocar(panel, shutdown_group, cfg['columna'], cfg.get('ancho', 1))
 
-        self.scroll_area.setWidget(scroll_content_widget)
+    def _desmontar_panel_apagado(self, panel):
+        """ Sin panel no se puede ver ni cancelar la cuenta atrás: se desarma. """
+        if self.shutdown_armed:
+            self.shutdown_armed = False
+            self.idle_counter = 0
+            print("Apagado automático DESARMADO (panel desactivado).")
 
     def toggle_shutdown(self, checked):
         self.shutdown_armed = checked
+        status_label = self.paneles['apagado']['status_label']
         if checked:
             print("Apagado automático ARMADO.")
-            self.shutdown_status_label.setText("Apagado: ARMADO (esperando GPU en reposo...)")
-            self.shutdown_status_label.setStyleSheet("color: #FFB84C;")
+            status_label.setText("Apagado: ARMADO (esperando GPU en reposo...)")
+            status_label.setStyleSheet("color: #FFB84C;")
         else:
             print("Apagado automático DESARMADO.")
             self.idle_counter = 0
-            self.shutdown_status_label.setText("Apagado: DESACTIVADO")
-            self.shutdown_status_label.setStyleSheet("color: #E0E0E0;")
+            status_label.setText("Apagado: DESACTIVADO")
+            status_label.setStyleSheet("color: #E0E0E0;")
 
     def trigger_shutdown(self):
         print("¡Disparando apagado del sistema en 1 segundo!")
+        panel = self.paneles['apagado']
         self.shutdown_armed = False
-        self.shutdown_checkbox.setChecked(False)
-        self.shutdown_status_label.setText("¡APAGANDO!")
-        self.shutdown_status_label.setStyleSheet("color: #FF4C4C;")
+        panel['checkbox'].setChecked(False)
+        panel['status_label'].setText("¡APAGANDO!")
+        panel['status_label'].setStyleSheet("color: #FF4C4C;")
         os.system("shutdown /s /t 1")
         self.close()
 
@@ -439,161 +681,177 @@ class MonitorDashboard(QMainWindow):
                     pass
 
             sorted_list = sorted(proc_list, key=lambda x: x[0], reverse=True)
+            self.top_procesos = sorted_list[:3] # Lo usa también el detector de tirones
 
-            top_3_labels = [self.top_proc_1, self.top_proc_2, self.top_proc_3]
-            for i in range(3):
+            panel = self.paneles.get('procesos')
+            if panel is None:
+                return
+            top_labels = panel['labels']
+            for i in range(len(top_labels)):
                 if i < len(sorted_list):
                     percent, name = sorted_list[i]
                     new_text = f"{i+1}. {name}: {percent:.1f}%"
-                    if top_3_labels[i].text() != new_text:
-                        top_3_labels[i].setText(new_text)
+                    if top_labels[i].text() != new_text:
+                        top_labels[i].setText(new_text)
                 else:
-                    if top_3_labels[i].text() != f"{i+1}. ...":
-                        top_3_labels[i].setText(f"{i+1}. ...")
+                    if top_labels[i].text() != f"{i+1}. ...":
+                        top_labels[i].setText(f"{i+1}. ...")
 
         except Exception as e:
             print(f"Error en Top Procesos: {e}")
 
-
-    def actualizar_datos(self):
-        # --- CPU ---
+    # --- Lógica de Contador de Picos ---
+    def _texto_pico(self, metrica, label):
+        count = self.picos[metrica]['count']
+        nombre = CATALOGO_METRICAS[metrica]['nombre']
+        if count == 0:
+            label.setText(f"{nombre}: Nunca")
+        else:
+            texto = "vez" if count == 1 else "veces"
+            label.setText(f"{nombre}: {count} {texto}")
+
+    def registrar_pico(self, metrica, valor):
+        panel = self.paneles.get('picos')
+        if panel is None or metrica not in panel['labels']:
+            return
+        estado = self.picos[metrica]
+        if valor > panel['config']['pico'] and not estado['high_flag']:
+            estado['count'] += 1
+            self._texto_pico(metrica, panel['labels'][metrica])
+            estado['high_flag'] = True
+        elif valor < panel['config']['rearme'] and estado['high_flag']:
+            estado['high_flag'] = False
+
+    def _añadir_a_grafica(self, panel, valor):
+        if 'plot' not in panel:
+            return
+        panel['plot_curve'].añadir(valor) # El motor de gráficas decide cuándo repintar
+
+    # --- Muestreo por fuente (cada una con su propio QTimer) ---
+    def muestrear_cpu(self):
         cpu_percent = psutil.cpu_percent()
-        cpu_mhz = psutil.cpu_freq().current
-        
+        self.registrar_pico('cpu', cpu_percent)
+
+        panel = self.paneles.get('cpu')
+        if panel is None:
+            return
+
         int_cpu_percent = int(cpu_percent)
-        if int_cpu_percent != self.last_cpu_percent:
-            self.cpu_usage_label.setText(f"Uso: {cpu_percent}%")
-            self.cpu_usage_bar.setValue(int_cpu_percent)
-            self.actualizar_estilo_barra_uso(self.cpu_usage_bar, cpu_percent)
-            self.last_cpu_percent = int_cpu_percent
-
-        cpu_ghz = cpu_mhz / 1000.0
-        if abs(cpu_ghz - self.last_cpu_ghz) > 0.01: 
-            self.cpu_clock_label.setText(f"Reloj: {cpu_ghz:.2f} GHz")
-            self.last_cpu_ghz = cpu_ghz
-            
-        self.cpu_plot_data.pop(0)
-        self.cpu_plot_data.append(cpu_percent)
-        self.cpu_plot_curve.setData(self.cpu_plot_data)
-
-        # --- Lógica de Contador para CPU ---
-        if cpu_percent > 95 and not self.cpu_high_flag:
-            self.cpu_peak_count += 1
-            texto = "vez" if self.cpu_peak_count == 1 else "veces"
-            self.cpu_peak_label.setText(f"CPU: {self.cpu_peak_count} {texto}")
-            self.cpu_high_flag = True
-        elif cpu_percent < 90 and self.cpu_high_flag:
-            self.cpu_high_flag = False
-
-        # --- GPU ---
-        if self.gpu_handle:
-            try:
-                temp = nvmlDeviceGetTemperature(self.gpu_handle, NVML_TEMPERATURE_GPU)
-                util = nvmlDeviceGetUtilizationRates(self.gpu_handle)
+        if int_cpu_percent != panel['last_percent']:
+            panel['usage_label'].setText(f"Uso: {cpu_percent}%")
+            panel['usage_bar'].setValue(int_cpu_percent)
+            self.actualizar_estilo_barra_uso(panel['usage_bar'], cpu_percent, panel['config']['umbrales'])
+            panel['last_percent'] = int_cpu_percent
+
+        cpu_ghz = psutil.cpu_freq().current / 1000.0
+        if abs(cpu_ghz - panel['last_ghz']) > 0.01: 
+            panel['clock_label'].setText(f"Reloj: {cpu_ghz:.2f} GHz")
+            panel['last_ghz'] = cpu_ghz
+
+        self._añadir_a_grafica(panel, cpu_percent)
+
+    def muestrear_gpu(self):
+        if not self.gpu_handle:
+            return
+        panel = self.paneles.get('gpu')
+        try:
+            temp = nvmlDeviceGetTemperature(self.gpu_handle, NVML_TEMPERATURE_GPU)
+            util = nvmlDeviceGetUtilizationRates(self.gpu_handle)
+            vram = nvmlDeviceGetMemoryInfo(self.gpu_handle)
+            vram_percent = int((vram.used / vram.total) * 100)
+
+            if panel is not None:
+                # Estos valores solo se muestran, no se consultan si no hay panel
                 fan = nvmlDeviceGetFanSpeed(self.gpu_handle)
-                vram = nvmlDeviceGetMemoryInfo(self.gpu_handle)
-                vram_percent = int((vram.used / vram.total) * 100)
                 clock = nvmlDeviceGetClockInfo(self.gpu_handle, NVML_CLOCK_GRAPHICS)
                 power = nvmlDeviceGetPowerUsage(self.gpu_handle)
                 power_w = int(power / 1000)
 
-                if temp != self.last_gpu_temp:
-                    self.gpu_temp_label.setText(f"Temp: {temp}°C")
-                    self.last_gpu_temp = temp
+                if temp != panel['last_temp']:
+                    panel['temp_label'].setText(f"Temp: {temp}°C")
+                    panel['last_temp'] = temp
                 
-                if util.gpu != self.last_gpu_util:
-                    self.gpu_usage_label.setText(f"Uso: {util.gpu}%")
-                    self.last_gpu_util = util.gpu
+                if util.gpu != panel['last_util']:
+                    panel['usage_label'].setText(f"Uso: {util.gpu}%")
+                    panel['last_util'] = util.gpu
                 
-                if fan != self.last_gpu_fan:
-                    self.gpu_fan_label.setText(f"Fan: {fan}%")
-                    self.last_gpu_fan = fan
+                if fan != panel['last_fan']:
+                    panel['fan_label'].setText(f"Fan: {fan}%")
+                    panel['last_fan'] = fan
                     
-                if vram_percent != self.last_vram_percent:
-                    self.gpu_vram_label.setText(f"VRAM: {vram_percent}%")
-                    self.gpu_vram_bar.setValue(vram_percent)
-                    self.actualizar_estilo_barra_uso(self.gpu_vram_bar, vram_percent)
-                    self.last_vram_percent = vram_percent
-                
-                if clock != self.last_gpu_clock:
-                    self.gpu_clock_label.setText(f"Reloj: {clock} MHz")
-                    self.last_gpu_clock = clock
-
-                if power_w != self.last_gpu_power:
-                    self.gpu_power_label.setText(f"Consumo: {power_w} W")
-                    self.last_gpu_power = power_w
-
-                self.gpu_plot_data.pop(0)
-                self.gpu_plot_data.append(util.gpu)
-                self.gpu_plot_curve.setData(self.gpu_plot_data)
-
-                # --- Lógica de Contador para GPU y VRAM ---
-                if util.gpu > 95 and not self.gpu_high_flag:
-                    self.gpu_peak_count += 1
-                    texto = "vez" if self.gpu_peak_count == 1 else "veces"
-                    self.gpu_peak_label.setText(f"GPU (Uso): {self.gpu_peak_count} {texto}")
-                    self.gpu_high_flag = True
-                elif util.gpu < 90 and self.gpu_high_flag:
-                    self.gpu_high_flag = False
+                if vram_percent != panel['last_vram_percent']:
+                    panel['vram_label'].setText(f"VRAM: {vram_percent}%")
+                    panel['vram_bar'].setValue(vram_percent)
+                    self.actualizar_estilo_barra_uso(panel['vram_bar'], vram_percent, panel['config']['umbrales'])
+                    panel['last_vram_percent'] = vram_percent
                 
-                if vram_percent > 95 and not self.vram_high_flag:
-                    self.vram_peak_count += 1
-                    texto = "vez" if self.vram_peak_count == 1 else "veces"
-                    self.vram_peak_label.setText(f"VRAM: {self.vram_peak_count} {texto}")
-                    self.vram_high_flag = True
-                elif vram_percent < 90 and self.vram_high_flag:
-                    self.vram_high_flag = False
-
-                # --- Lógica de apagado ---
-                SHUTDOWN_SECONDS = 60 
-                if self.shutdown_armed:
-                    if temp < 50 and util.gpu < 10:
-                        self.idle_counter += 1
-                        remaining = SHUTDOWN_SECONDS - self.idle_counter
-                        status_text = f"Apagado: GPU en reposo. Apagando en {remaining}s..."
-                        if self.shutdown_status_label.text() != status_text:
-                            self.shutdown_status_label.setText(status_text)
-                        
-                        if self.idle_counter >= SHUTDOWN_SECONDS:
-                            self.trigger_shutdown()
-                    else:
-                        if self.idle_counter != 0:
-                            self.idle_counter = 0
-                            self.shutdown_status_label.setText("Apagado: ARMADO (esperando GPU en reposo...)")
-
-            except NVMLError as e:
-                if e.value == NVML_ERROR_NOT_SUPPORTED:
-                    if self.last_gpu_power != -999: 
-                        self.gpu_power_label.setText("Consumo: N/A")
-                        self.last_gpu_power = -999
+                if clock != panel['last_clock']:
+                    panel['clock_label'].setText(f"Reloj: {clock} MHz")
+                    panel['last_clock'] = clock
+
+                if power_w != panel['last_power']:
+                    panel['power_label'].setText(f"Consumo: {power_w} W")
+                    panel['last_power'] = power_w
+
+                self._añadir_a_grafica(panel, util.gpu)
+
+            # --- Lógica de Contador para GPU y VRAM ---
+            self.registrar_pico('gpu', util.gpu)
+            self.registrar_pico('vram', vram_percent)
+
+            # --- Lógica de apagado ---
+            SHUTDOWN_SECONDS = 60 
+            if self.shutdown_armed:
+                status_label = self.paneles['apagado']['status_label']
+                if temp < 50 and util.gpu < 10:
+                    self.idle_counter += self.config["fuentes"]["gpu"] / 1000
+                    remaining = int(SHUTDOWN_SECONDS - self.idle_counter)
+                    status_text = f"Apagado: GPU en reposo. Apagando en {remaining}s..."
+                    if status_label.text() != status_text:
+                        status_label.setText(status_text)
+                    
+                    if self.idle_counter >= SHUTDOWN_SECONDS:
+                        self.trigger_shutdown()
                 else:
-                    self.gpu_temp_label.setText("Temp: Error")
-
-        # --- RAM ---
+                    if self.idle_counter != 0:
+                        self.idle_counter = 0
+                        status_label.setText("Apagado: ARMADO (esperando GPU en reposo...)")
+
+        except NVMLError as e:
+            if panel is None:
+                return
+            if e.value == NVML_ERROR_NOT_SUPPORTED:
+                if panel['last_power'] != -999: 
+                    panel['power_label'].setText("Consumo: N/A")
+                    panel['last_power'] = -999
+            else:
+                panel['temp_label'].setText("Temp: Error")
+
+    def muestrear_ram(self):
         ram = psutil.virtual_memory()
-        
+        self.registrar_pico('ram', ram.percent)
+
+        panel = self.paneles.get('ram')
+        if panel is None:
+            return
+
         int_ram_percent = int(ram.percent)
-        if int_ram_percent != self.last_ram_percent:
-            self.ram_usage_label.setText(f"RAM: {ram.percent}%")
-            self.ram_usage_bar.setValue(int_ram_percent)
-            self.actualizar_estilo_barra_uso(self.ram_usage_bar, ram.percent)
-            self.last_ram_percent = int_ram_percent
-
-        self.ram_plot_data.pop(0)
-        self.ram_plot_data.append(ram.percent)
-        self.ram_plot_curve.setData(self.ram_plot_data)
-
-        # --- Lógica de Contador para RAM ---
-        if ram.percent > 95 and not self.ram_high_flag:
-            self.ram_peak_count += 1
-            texto = "vez" if self.ram_peak_count == 1 else "veces"
-            self.ram_peak_label.setText(f"RAM: {self.ram_peak_count} {texto}")
-            self.ram_high_flag = True
-        elif ram.percent < 90 and self.ram_high_flag:
-            self.ram_high_flag = False
+        if int_ram_percent != panel['last_percent']:
+            panel['usage_label'].setText(f"RAM: {ram.percent}%")
+            panel['usage_bar'].setValue(int_ram_percent)
+            self.actualizar_estilo_barra_uso(panel['usage_bar'], ram.percent, panel['config']['umbrales'])
+            panel['last_percent'] = int_ram_percent
+
+        self._añadir_a_grafica(panel, ram.percent)
 
+    def muestrear_discos(self):
         # --- (CORRECCIÓN WMI) Lógica de Discos ---
+        panel = self.paneles.get('discos')
+        if panel is None:
+            return
         new_disk_io = psutil.disk_io_counters(perdisk=True)
+        now = time.monotonic()
+        elapsed = max(now - self.last_disk_time, 1e-3)
 
         # Obtener datos de % de WMI PerfMon una vez
         perf_data_map = {}
@@ -610,13 +868,13 @@ class MonitorDashboard(QMainWindow):
                 pass 
 
         for drive_name in self.physical_drives_psutil:
-            if drive_name not in self.disk_widgets:
+            if drive_name not in panel['unidades']:
                 continue
             try:
                 old_io = self.last_disk_io[drive_name]
                 new_io = new_disk_io[drive_name]
 
-                widgets = self.disk_widgets[drive_name]
+                widgets = panel['unidades'][drive_name]
                 info = widgets['info']
 
                 # % Actividad desde WMI
@@ -635,9 +893,9 @@ class MonitorDashboard(QMainWindow):
                                 percent = float(perf_obj.PercentDiskTime)
                                 break
                 
-                # Velocidad MB/s (Esta parte ahora SÍ se ejecutará)
-                read_bytes_s = new_io.read_bytes - old_io.read_bytes
-                write_bytes_s = new_io.write_bytes - old_io.write_bytes
+                # Velocidad MB/s (dividido por el tiempo real entre muestras)
+                read_bytes_s = (new_io.read_bytes - old_io.read_bytes) / elapsed
+                write_bytes_s = (new_io.write_bytes - old_io.write_bytes) / elapsed
                 read_mb_s = read_bytes_s / 1024 / 1024
                 write_mb_s = write_bytes_s / 1024 / 1024
 
@@ -647,7 +905,7 @@ class MonitorDashboard(QMainWindow):
                     label_text = f"Unidad ({info['letters']}): {percent:.1f}%"
                     widgets['label'].setText(label_text)
                     widgets['bar'].setValue(int_percent)
-                    self.actualizar_estilo_barra_uso(widgets['bar'], percent)
+                    self.actualizar_estilo_barra_uso(widgets['bar'], percent, panel['config']['umbrales'])
                     widgets['last_percent'] = int_percent
 
                 if abs(read_mb_s - widgets['last_read_mb_s']) > 0.01:
@@ -657,38 +915,91 @@ class MonitorDashboard(QMainWindow):
                 if abs(write_mb_s - widgets['last_write_mb_s']) > 0.01:
                     widgets['write_label'].setText(f"E: {write_mb_s:.1f} MB/s")
                     widgets['last_write_mb_s'] = write_mb_s
-                # --- FIN CAMBIO ---
 
             except KeyError:
                 pass
             except Exception as e:
                 print(f"Error disco {drive_name}: {e}")
         self.last_disk_io = new_disk_io
+        self.last_disk_time = now
         # --- (FIN CORRECCIÓN WMI) ---
 
-
-        # --- Red ---
+    def muestrear_red(self):
+        panel = self.paneles.get('red')
+        if panel is None:
+            return
         net_io = psutil.net_io_counters()
-        bytes_sent_s = net_io.bytes_sent - self.last_bytes_sent
-        bytes_recv_s = net_io.bytes_recv - self.last_bytes_recv
+        now = time.monotonic()
+        elapsed = max(now - self.last_net_time, 1e-3)
+        bytes_sent_s = (net_io.bytes_sent - self.last_bytes_sent) / elapsed
+        bytes_recv_s = (net_io.bytes_recv - self.last_bytes_recv) / elapsed
         mb_recv_s = bytes_recv_s / 1024 / 1024
         mb_sent_s = bytes_sent_s / 1024 / 1024
         
-        if abs(mb_recv_s - self.last_net_down) > 0.001:
-             self.net_down_label.setText(f"Descarga: {mb_recv_s:.2f} MB/s")
-             self.last_net_down = mb_recv_s
+        if abs(mb_recv_s - panel['last_down']) > 0.001:
+             panel['down_label'].setText(f"Descarga: {mb_recv_s:.2f} MB/s")
+             panel['last_down'] = mb_recv_s
 
-        if abs(mb_sent_s - self.last_net_up) > 0.001:
-            self.net_up_label.setText(f"Subida: {mb_sent_s:.2f} MB/s")
-            self.last_net_up = mb_sent_s
+        if abs(mb_sent_s - panel['last_up']) > 0.001:
+            panel['up_label'].setText(f"Subida: {mb_sent_s:.2f} MB/s")
+            panel['last_up'] = mb_sent_s
             
         self.last_bytes_sent = net_io.bytes_sent
         self.last_bytes_recv = net_io.bytes_recv
+        self.last_net_time = now
+
+    def muestrear_tirones(self):
+        """ Muestreo rápido de GPU, núcleos y escritura en disco para el detector. """
+        panel = self.paneles.get('tirones')
+        if panel is None:
+            return
+        muestra = {'nucleos': psutil.cpu_percent(percpu=True)}
+
+        if self.gpu_handle:
+            try:
+                muestra['gpu'] = nvmlDeviceGetUtilizationRates(self.gpu_handle).gpu
+                vram = nvmlDeviceGetMemoryInfo(self.gpu_handle)
+                muestra['vram'] = vram.used / vram.total * 100
+            except NVMLError:
+                pass
+
+        new_disk_io = psutil.disk_io_counters(perdisk=True)
+        now = time.monotonic()
+        elapsed = max(now - self.last_hitch_time, 1e-3)
+        muestra['escritura_disco'] = {
+            name: (io.write_bytes - self.last_hitch_disk_io[name].write_bytes) / elapsed / 1024 / 1024
+            for name, io in new_disk_io.items() if name in self.last_hitch_disk_io
+        }
+        self.last_hitch_disk_io = new_disk_io
+        self.last_hitch_time = now
+
+        if self.top_procesos:
+            percent, name = self.top_procesos[0]
+            muestra['top_proceso'] = (name, percent)
+
+        detector = panel['detector']
+        informe = detector.añadir_muestra(time.time(), muestra)
+        if informe is None:
+            # El top de procesos se refresca cada pocos segundos: al empezar una
+            # caída se mide ya para que el siguiente tick lleve el top actual
+            if detector.pendiente is not None and detector.pendiente['ticks'] == 0:
+                self.actualizar_top_procesos()
+            return
+
+        # Mostrar los informes más recientes primero
+        nombres_disco = {name: f"Unidad ({info['letters']})" for name, info in self.drive_info_map.items()}
+        informes = list(detector.informes)[::-1]
+        for label, inf in zip(panel['labels'], informes):
+            hora = time.strftime('%H:%M:%S', time.localtime(inf['t']))
+            causas = ", ".join(describir_anomalia(a, nombres_disco) for a in inf['anomalias'][:3])
+            label.setText(f"{hora} GPU {inf['gpu_antes']:.0f}% → {inf['gpu_min']:.0f}% | "
+                          f"{causas or 'Sin causa clara'}")
 
     # --- Funciones de estilo ---
-    def actualizar_estilo_barra_uso(self, bar_widget, percent):
-        if percent > 90: color = "#FF4C4C"
-        elif percent > 70: color = "#FFB84C"
+    def actualizar_estilo_barra_uso(self, bar_widget, percent, umbrales=(70, 90)):
+        aviso, critico = umbrales
+        if percent > critico: color = "#FF4C4C"
+        elif percent > aviso: color = "#FFB84C"
         else: color = "#4CFFB8"
         bar_widget.setStyleSheet(f"QProgressBar::chunk {{ background-color: {color}; border-radius: 5px; }}")
 
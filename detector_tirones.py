@@ -0,0 +1,280 @@
+"""
+Detector de tirones (stutter) correlacionado con eventos.
+
+No depende de Qt ni de psutil: recibe una muestra por tick y devuelve un
+informe cuando detecta un tirón, así que se puede probar con trazas sintéticas
+(ver traza_sintetica y la demo al final del archivo).
+
+Un tirón es una caída brusca del uso de GPU mientras el juego sigue cargando
+la GPU: si el uso no se recupera en unos pocos ticks (pantalla de carga,
+alt-tab, juego cerrado) la caída se descarta y no se detecta otra hasta
+que la GPU vuelva a la carga anterior.
+
+Formato de cada muestra (todas las claves son opcionales):
+    {
+        'gpu': 97.0,                                  # Uso de GPU (%)
+        'vram': 88.0,                                 # Uso de VRAM (%)
+        'nucleos': [40.0, 100.0, ...],                # Uso por núcleo (%)
+        'escritura_disco': {'PhysicalDrive0': 1.2},   # Escritura (MB/s)
+        'top_proceso': ('game.exe', 23.5),            # Proceso con más CPU
+    }
+
+Coste por tick: O(núcleos + discos). Memoria: acotada por 'ventana'.
+"""
+import math
+import random
+from collections import deque, Counter
+
+# --- Criterios de anomalía por tipo de señal ---
+VRAM_CRITICA = 95.0       # VRAM al 95% o más
+NUCLEO_SATURADO = 95.0    # Un núcleo "clavado"
+ESCRITURA_MINIMA = 5.0    # MB/s para considerar una ráfaga de escritura
+Z_MINIMO = 2.0            # Desviaciones sobre la media para ser anómalo
+DESVIACION_MINIMA = 1.0   # Evita fuerzas infinitas con señales planas
+
+
+class EstadisticaMovil:
+    """ Media y desviación de las últimas N muestras en O(1) por muestra. """
+
+    def __init__(self, tamaño):
+        self.valores = deque(maxlen=tamaño)
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+
+    def añadir(self, valor):
+        if len(self.valores) == self.valores.maxlen:
+            viejo = self.valores[0]
+            self.suma -= viejo
+            self.suma_cuadrados -= viejo * viejo
+        self.valores.append(valor)
+        self.suma += valor
+        self.suma_cuadrados += valor * valor
+
+    def __len__(self):
+        return len(self.valores)
+
+    def media(self):
+        return self.suma / len(self.valores) if self.valores else 0.0
+
+    def desviacion(self):
+        n = len(self.valores)
+        if n < 2:
+            return 0.0
+        varianza = max(self.suma_cuadrados / n - self.media() ** 2, 0.0)
+        return math.sqrt(varianza)
+
+    def z(self, valor):
+        return (valor - self.media()) / max(self.desviacion(), DESVIACION_MINIMA)
+
+
+class DetectorTirones:
+    """ Detecta caídas bruscas de GPU y las correlaciona con el resto de fuentes.
+
+    Las últimas 'ventana_evento' muestras forman la ventana del tirón; las
+    'ventana' anteriores forman la línea base con la que se comparan. """
+
+    def __init__(self, ventana=120, ventana_evento=3, caida=30, carga_minima=60,
+                 ticks_recuperacion=8, muestras_minimas=10, max_informes=20):
+        # Con menos muestras en la línea base nunca se detectaría nada, y sin
+        # caída positiva cualquier tick contaría como tirón
+        if ventana < muestras_minimas:
+            raise ValueError(f"ventana ({ventana}) no puede ser menor que muestras_minimas ({muestras_minimas})")
+        if caida <= 0:
+            raise ValueError(f"caida debe ser mayor que 0 (es {caida})")
+        self.ventana = ventana
+        self.caida = caida
+        self.carga_minima = carga_minima
+        self.ticks_recuperacion = ticks_recuperacion
+        self.muestras_minimas = muestras_minimas
+
+        self.recientes = deque(maxlen=ventana_evento)
+        self.base = {}                        # señal -> EstadisticaMovil
+        self.top_base = deque(maxlen=ventana) # nombres del top en la línea base
+        self.top_base_conteo = Counter()
+        self.pendiente = None
+        self.bloqueo = None # Caída descartada: no se detecta otra hasta que vuelva la carga
+        self.informes = deque(maxlen=max_informes)
+
+    def añadir_muestra(self, t, muestra):
+        """ Procesa un tick. Devuelve el informe del tirón si se confirma en este tick. """
+        if len(self.recientes) == self.recientes.maxlen:
+            viejo, excluida = self.recientes[0]
+            if not excluida:
+                self._pasar_a_base(viejo)
+        # Las muestras de una caída (pendiente o descartada) no entran en la línea base
+        entrada = [muestra, False]
+        self.recientes.append(entrada)
+
+        gpu = muestra.get('gpu')
+        estadistica_gpu = self.base.get(('gpu', None))
+        if gpu is None or estadistica_gpu is None or len(estadistica_gpu) < self.muestras_minimas:
+            return None
+
+        if self.bloqueo is not None:
+            entrada[1] = True
+            self.bloqueo['ticks'] += 1
+            if gpu >= self.bloqueo['gpu_antes'] - self.caida / 2:
+                self.bloqueo = None # La carga ha vuelto
+            elif self.bloqueo['ticks'] >= self.ventana:
+                self._reiniciar_base() # La carga cambió de nivel: volver a aprender
+            return None
+
+        if self.pendiente is None:
+            gpu_antes = estadistica_gpu.media()
+            if gpu_antes >= self.carga_minima and gpu <= gpu_antes - self.caida:
+                entrada[1] = True
+                self.pendiente = {
+                    't': t, 'gpu_antes': gpu_antes, 'gpu_min': gpu,
+                    'ticks': 0, 'anomalias': {},
+                }
+                self._acumular_anomalias()
+            return None
+
+        # --- Tirón pendiente de confirmar ---
+        entrada[1] = True
+        pendiente = self.pendiente
+        pendiente['ticks'] += 1
+        pendiente['gpu_min'] = min(pendiente['gpu_min'], gpu)
+        self._acumular_anomalias()
+
+        if gpu >= pendiente['gpu_antes'] - self.caida / 2:
+            # La carga sigue: es un tirón de verdad
+            self.pendiente = None
+            informe = {
+                't': pendiente['t'],
+                'gpu_antes': pendiente['gpu_antes'],
+                'gpu_min': pendiente['gpu_min'],
+                'duracion_ticks': pendiente['ticks'],
+                'anomalias': sorted(pendiente['anomalias'].values(),
+                                    key=lambda a: a['fuerza'], reverse=True),
+            }
+            self.informes.append(informe)
+            return informe
+
+        if pendiente['ticks'] >= self.ticks_recuperacion:
+            # La carga terminó (pantalla de carga, alt-tab...): no es un tirón
+            self.pendiente = None
+            self.bloqueo = {'gpu_antes': pendiente['gpu_antes'], 'ticks': 0}
+        return None
+
+    def _reiniciar_base(self):
+        self.base.clear()
+        self.top_base.clear()
+        self.top_base_conteo.clear()
+        self.bloqueo = None
+
+    def _pasar_a_base(self, muestra):
+        """ Una muestra que sale de la ventana del evento entra en la línea base. """
+        for señal, valor in self._señales(muestra):
+            estadistica = self.base.get(señal)
+            if estadistica is None:
+                estadistica = self.base[señal] = EstadisticaMovil(self.ventana)
+            estadistica.añadir(valor)
+
+        nombre = muestra['top_proceso'][0] if muestra.get('top_proceso') else None
+        if len(self.top_base) == self.top_base.maxlen:
+            viejo = self.top_base[0]
+            self.top_base_conteo[viejo] -= 1
+            if self.top_base_conteo[viejo] <= 0:
+                del self.top_base_conteo[viejo]
+        self.top_base.append(nombre)
+        self.top_base_conteo[nombre] += 1
+
+    def _señales(self, muestra):
+        """ Descompone una muestra en pares ((tipo, detalle), valor). """
+        if 'gpu' in muestra:
+            yield ('gpu', None), muestra['gpu']
+        if 'vram' in muestra:
+            yield ('vram', None), muestra['vram']
+        for i, valor in enumerate(muestra.get('nucleos', ())):
+            yield ('nucleo', i), valor
+        for disco, valor in muestra.get('escritura_disco', {}).items():
+            yield ('disco', disco), valor
+        if muestra.get('top_proceso'):
+            yield ('top', None), muestra['top_proceso'][1]
+
+    def _acumular_anomalias(self):
+        """ Evalúa la ventana del evento y guarda la anomalía más fuerte por señal. """
+        anomalias = self.pendiente['anomalias']
+        for muestra, _ in self.recientes:
+            for anomalia in self._anomalias_de(muestra):
+                clave = (anomalia['fuente'], anomalia['detalle'])
+                if clave not in anomalias or anomalia['fuerza'] > anomalias[clave]['fuerza']:
+                    anomalias[clave] = anomalia
+
+    def _anomalias_de(self, muestra):
+        for (tipo, detalle), valor in self._señales(muestra):
+            if tipo in ('gpu', 'top'):
+                continue
+            if tipo == 'vram' and valor < VRAM_CRITICA:
+                continue
+            if tipo == 'nucleo' and valor < NUCLEO_SATURADO:
+                continue
+            if tipo == 'disco' and valor < ESCRITURA_MINIMA:
+                continue
+            estadistica = self.base.get((tipo, detalle))
+            if estadistica is None or len(estadistica) < self.muestras_minimas:
+                continue
+            fuerza = estadistica.z(valor)
+            if fuerza >= Z_MINIMO:
+                yield {'fuente': tipo, 'detalle': detalle, 'valor': valor, 'fuerza': fuerza}
+
+        # Proceso que no estaba en el top durante la línea base
+        top = muestra.get('top_proceso')
+        if top and top[0] not in self.top_base_conteo:
+            estadistica = self.base.get(('top', None))
+            if estadistica is not None and len(estadistica) >= self.muestras_minimas:
+                fuerza = estadistica.z(top[1])
+                if fuerza >= Z_MINIMO:
+                    yield {'fuente': 'proceso', 'detalle': top[0], 'valor': top[1], 'fuerza': fuerza}
+
+
+def describir_anomalia(anomalia, nombres_disco=None):
+    """ Texto corto para mostrar una anomalía en la interfaz. """
+    fuente, detalle, valor = anomalia['fuente'], anomalia['detalle'], anomalia['valor']
+    if fuente == 'vram':
+        texto = f"VRAM {valor:.0f}%"
+    elif fuente == 'nucleo':
+        texto = f"Núcleo {detalle} al {valor:.0f}%"
+    elif fuente == 'disco':
+        nombre = (nombres_disco or {}).get(detalle, detalle)
+        texto = f"Escritura {nombre} {valor:.1f} MB/s"
+    else:
+        texto = f"Nuevo top: {detalle} {valor:.1f}%"
+    return f"{texto} (x{anomalia['fuerza']:.1f})"
+
+
+# --- Traza sintética (demo y tests) ---
+def traza_sintetica(ticks=400, tirones=(120, 250, 330), seed=1):
+    """ Juego a ~95% de GPU con tirones inyectados y una causa distinta en cada uno:
+    escritura en PhysicalDrive1, núcleo 3 saturado y antivirus.exe en el top. """
+    rng = random.Random(seed)
+    causas = ['disco', 'nucleo', 'proceso']
+    for t in range(ticks):
+        muestra = {
+            'gpu': 95 + rng.uniform(-3, 3),
+            'vram': 80 + rng.uniform(-2, 2),
+            'nucleos': [40 + rng.uniform(-10, 10) for _ in range(8)],
+            'escritura_disco': {'PhysicalDrive0': rng.uniform(0, 2), 'PhysicalDrive1': rng.uniform(0, 1)},
+            'top_proceso': ('game.exe', 20 + rng.uniform(-2, 2)),
+        }
+        for i, inicio in enumerate(tirones):
+            if inicio <= t < inicio + 2:
+                muestra['gpu'] = 35 + rng.uniform(-5, 5)
+                causa = causas[i % len(causas)]
+                if causa == 'disco':
+                    muestra['escritura_disco']['PhysicalDrive1'] = 180.0
+                elif causa == 'nucleo':
+                    muestra['nucleos'][3] = 100.0
+                else:
+                    muestra['top_proceso'] = ('antivirus.exe', 45.0)
+        yield t, muestra
+
+
+if __name__ == "__main__":
+    detector = DetectorTirones()
+    for t, muestra in traza_sintetica():
+        informe = detector.añadir_muestra(t, muestra)
+        if informe:
+            causas = ", ".join(describir_anomalia(a) for a in informe['anomalias']) or "sin causa clara"
+            print(f"t={informe['t']}: GPU {informe['gpu_antes']:.0f}% -> {informe['gpu_min']:.0f}% | {causas}")
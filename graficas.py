@@ -0,0 +1,237 @@
+"""
+Motor de gráficas de historial de bajo coste.
+
+- HistorialCurva: búfer circular con añadido O(1) y diezmado min/max por
+  columna de píxel que conserva los picos (un pico de 1 s sigue viéndose en
+  una gráfica de 1 h).
+- GraficaHistorial: PlotWidget con ejes fijos (sin autorange ni ratón) que
+  solo vuelca datos a sus curvas cuando el motor se lo pide.
+- MotorGraficas: agrupa los repintados de todas las gráficas con un límite
+  global de FPS y se salta las que están fuera de la vista del QScrollArea.
+"""
+import math
+import time
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import QObject, QTimer
+
+
+class _Anillo:
+    """ Búfer circular con copia doble: la vista de los últimos N valores
+    es contigua y no necesita copias. """
+
+    def __init__(self, tamaño, relleno=0.0):
+        self.tamaño = tamaño
+        self.datos = np.full(2 * tamaño, relleno, dtype=np.float32)
+        self.pos = 0
+
+    def añadir(self, valor):
+        self.datos[self.pos] = valor
+        self.datos[self.pos + self.tamaño] = valor
+        self.pos = (self.pos + 1) % self.tamaño
+
+    def vista(self):
+        """ Valores del más antiguo al más reciente. """
+        return self.datos[self.pos:self.pos + self.tamaño]
+
+
+class HistorialCurva:
+    """ Historial de una curva con diezmado incremental min/max.
+
+    Las cubetas están alineadas al índice absoluto de la muestra, así que al
+    desplazarse la gráfica los picos no "bailan" entre columnas. """
+
+    def __init__(self, capacidad, columnas=1):
+        self.capacidad = capacidad
+        self.crudo = _Anillo(capacidad) # Empieza lleno de ceros, como antes
+        self.total = 0
+        self.grafica = None
+        self.ajustar_columnas(columnas)
+
+    def ajustar_columnas(self, columnas):
+        """ Recalcula las cubetas para 'columnas' píxeles de ancho. O(capacidad). """
+        self.columnas = max(1, int(columnas))
+        if self.capacidad <= 2 * self.columnas:
+            self.cubeta = 1 # Caben todos los puntos: no hace falta diezmar
+            self.x_crudo = np.arange(self.capacidad, dtype=np.float32)
+            return
+
+        b = self.cubeta = math.ceil(self.capacidad / self.columnas)
+        n = self.n_cubetas = math.ceil(self.capacidad / b) + 1 # +1 por el borde izquierdo
+        valores = self.crudo.vista()
+        inicio_ventana = self.total - self.capacidad
+        fin_completas = (self.total // b) * b - inicio_ventana
+
+        # La cubeta que corta el borde izquierdo solo tiene las muestras de la
+        # ventana; las cubetas anteriores no se conocen y datos() no las devuelve
+        cabeza = fin_completas % b
+        bloques = valores[cabeza:fin_completas].reshape(-1, b)
+        mins, maxs = bloques.min(axis=1), bloques.max(axis=1)
+        if cabeza:
+            mins = np.concatenate([[valores[:cabeza].min()], mins])
+            maxs = np.concatenate([[valores[:cabeza].max()], maxs])
+
+        self.mins = _Anillo(n, relleno=np.nan)
+        self.maxs = _Anillo(n, relleno=np.nan)
+        k = len(mins)
+        self.mins.datos[n - k:n] = self.mins.datos[2 * n - k:] = mins
+        self.maxs.datos[n - k:n] = self.maxs.datos[2 * n - k:] = maxs
+
+        parcial = valores[fin_completas:]
+        self.parcial_n = len(parcial)
+        self.parcial_min = float(parcial.min()) if len(parcial) else 0.0
+        self.parcial_max = float(parcial.max()) if len(parcial) else 0.0
+
+    def copiar_historial(self, otra):
+        """ Toma las últimas muestras de otra curva (p. ej. al cambiar 'puntos'). """
+        valores = otra.crudo.vista()[-self.capacidad:]
+        n = len(valores)
+        self.crudo = _Anillo(self.capacidad)
+        self.crudo.datos[self.capacidad - n:self.capacidad] = valores
+        self.crudo.datos[2 * self.capacidad - n:] = valores
+        self.total = otra.total
+        self.ajustar_columnas(self.columnas)
+        if self.grafica is not None:
+            self.grafica.marcar_sucia()
+
+    def añadir(self, valor):
+        """ Añade una muestra en O(1). """
+        self.crudo.añadir(valor)
+        self.total += 1
+        if self.cubeta > 1:
+            if self.parcial_n == 0:
+                self.parcial_min = self.parcial_max = valor
+            else:
+                self.parcial_min = min(self.parcial_min, valor)
+                self.parcial_max = max(self.parcial_max, valor)
+            self.parcial_n += 1
+            if self.total % self.cubeta == 0:
+                self.mins.añadir(self.parcial_min)
+                self.maxs.añadir(self.parcial_max)
+                self.parcial_n = 0
+        if self.grafica is not None:
+            self.grafica.marcar_sucia()
+
+    def datos(self):
+        """ Devuelve (x, y) listos para pintar: como mucho ~2 puntos por píxel.
+        El eje x va de 0 (más antiguo) a capacidad - 1 (más reciente). """
+        if self.cubeta == 1:
+            return self.x_crudo, self.crudo.vista().copy()
+
+        b = self.cubeta
+        primera = (self.total // b) * b - self.n_cubetas * b - (self.total - self.capacidad)
+        fuera = max(0, -primera // b) # Cubetas que terminan antes del borde izquierdo (x <= 0)
+        mins = self.mins.vista()[fuera:]
+        maxs = self.maxs.vista()[fuera:]
+        if self.parcial_n:
+            mins = np.append(mins, self.parcial_min)
+            maxs = np.append(maxs, self.parcial_max)
+        y = np.empty(2 * len(mins), dtype=np.float32)
+        y[0::2] = mins
+        y[1::2] = maxs
+
+        primera += fuera * b
+        x = np.repeat(primera + np.arange(len(mins), dtype=np.float32) * b, 2)
+        return x, y
+
+
+class GraficaHistorial(pg.PlotWidget):
+    """ Gráfica de historial con ejes fijos 0..capacidad x 0..100. """
+
+    def __init__(self, titulo, capacidad, motor=None):
+        super().__init__()
+        self.capacidad = capacidad
+        self.motor = motor
+        self.curvas = []
+        self.sucia = False
+
+        plot_item = self.getPlotItem()
+        plot_item.setMouseEnabled(x=False, y=False)
+        plot_item.setMenuEnabled(False)
+        plot_item.hideButtons()
+        self.setTitle(titulo)
+        self.setXRange(0, capacidad - 1, padding=0)
+        self.setYRange(0, 100)
+        plot_item.disableAutoRange()
+        self.getAxis('bottom').setTicks([])
+        self.getAxis('left').setPen(None)
+        self.setBackground(None)
+
+        self.getViewBox().sigResized.connect(self._ajustar_resolucion)
+        if motor is not None:
+            motor.registrar(self)
+
+    def añadir_curva(self, color):
+        curva = HistorialCurva(self.capacidad, self._columnas())
+        curva.grafica = self
+        curva.item = pg.PlotCurveItem(pen=color)
+        self.addItem(curva.item)
+        self.curvas.append(curva)
+        self.marcar_sucia()
+        return curva
+
+    def _columnas(self):
+        return max(1, int(self.getViewBox().width()))
+
+    def _ajustar_resolucion(self):
+        columnas = self._columnas()
+        for curva in self.curvas:
+            if curva.columnas != columnas:
+                curva.ajustar_columnas(columnas)
+        self.marcar_sucia()
+
+    def marcar_sucia(self):
+        self.sucia = True
+        if self.motor is not None:
+            self.motor.solicitar()
+        else:
+            self.volcar()
+
+    def en_pantalla(self):
+        """ False si está oculta o desplazada fuera de la vista del QScrollArea. """
+        # El viewport tapa todo el widget: su región visible es la que cuenta
+        return self.isVisible() and not self.viewport().visibleRegion().isEmpty()
+
+    def volcar(self):
+        """ Pasa los datos diezmados a las curvas (esto es lo que provoca el repintado). """
+        for curva in self.curvas:
+            x, y = curva.datos()
+            curva.item.setData(x, y, skipFiniteCheck=True)
+        self.sucia = False
+
+
+class MotorGraficas(QObject):
+    """ Limita los volcados de todas las gráficas a 'fps_max' por segundo y
+    solo vuelca las que se ven. Las ocultas quedan pendientes hasta que
+    vuelvan a la vista (llamar a solicitar() al desplazar el scroll). """
+
+    def __init__(self, fps_max=10, parent=None):
+        super().__init__(parent)
+        self.graficas = []
+        self.ultimo_volcado = 0.0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.volcar)
+        self.ajustar_fps(fps_max)
+
+    def ajustar_fps(self, fps_max):
+        self.intervalo = 1.0 / max(1, fps_max)
+
+    def registrar(self, grafica):
+        self.graficas.append(grafica)
+
+    def eliminar(self, grafica):
+        if grafica in self.graficas:
+            self.graficas.remove(grafica)
+
+    def solicitar(self):
+        if self.timer.isActive():
+            return
+        espera = self.intervalo - (time.monotonic() - self.ultimo_volcado)
+        self.timer.start(max(0, int(espera * 1000)))
+
+    def volcar(self):
+        self.ultimo_volcado = time.monotonic()
+        for grafica in self.graficas:
+            if grafica.sucia and grafica.en_pantalla():
+                grafica.volcar()
@@ -0,0 +1,73 @@
+"""
+Tests de la lectura y validación de dashboard_config.json (sin Qt ni hardware).
+
+    python -m pytest test_configuracion.py
+"""
+import copy
+import json
+
+import pytest
+
+from configuracion import CONFIG_POR_DEFECTO, cargar_config
+
+
+def cargar(tmp_path, datos):
+    ruta = tmp_path / "dashboard_config.json"
+    ruta.write_text(datos if isinstance(datos, str) else json.dumps(datos), encoding='utf-8')
+    return cargar_config(str(ruta))
+
+
+def test_sin_archivo_usa_los_valores_por_defecto(tmp_path):
+    assert cargar_config(str(tmp_path / "no_existe.json")) == CONFIG_POR_DEFECTO
+
+
+def test_grafica_parcial_se_combina_con_la_de_por_defecto(tmp_path):
+    por_defecto = copy.deepcopy(CONFIG_POR_DEFECTO)
+    config = cargar(tmp_path, {"paneles": {"cpu": {"grafica": {"color": "r"}}}})
+    assert config["paneles"]["cpu"]["grafica"] == {**por_defecto["paneles"]["cpu"]["grafica"], "color": "r"}
+    assert CONFIG_POR_DEFECTO == por_defecto # Los valores por defecto no se modifican
+
+
+def test_grafica_null_quita_la_grafica(tmp_path):
+    config = cargar(tmp_path, {"paneles": {"gpu": {"grafica": None}}})
+    assert config["paneles"]["gpu"]["grafica"] is None
+
+
+def test_claves_desconocidas_se_ignoran(tmp_path):
+    config = cargar(tmp_path, {
+        "fuentes": {"bateria": 500},
+        "graficas": {"antialias": True},
+        "paneles": {"bateria": {"activo": True}, "cpu": {"transparencia": 0.5}},
+        "tema": "claro",
+    })
+    assert config == CONFIG_POR_DEFECTO
+
+
+@pytest.mark.parametrize("texto", ['{"paneles": ', '[1, 2]', '"cpu"', 'null', '{"paneles": []}',
+                                   '{"fuentes": 5}', '{"paneles": {"cpu": false}}'])
+def test_json_roto_o_bloques_que_no_son_objetos(tmp_path, texto):
+    with pytest.raises(ValueError):
+        cargar(tmp_path, texto)
+
+
+@pytest.mark.parametrize("datos", [
+    {"fuentes": {"cpu": 50}},
+    {"fuentes": {"cpu": "1000"}},
+    {"graficas": {"fps_max": 0}},
+    {"paneles": {"cpu": {"activo": 1}}},
+    {"paneles": {"cpu": {"fila": -1}}},
+    {"paneles": {"cpu": {"umbrales": [90]}}},
+    {"paneles": {"cpu": {"umbrales": [90, 70]}}},
+    {"paneles": {"cpu": {"grafica": {"puntos": 1}}}},
+    {"paneles": {"cpu": {"grafica": {"columna": 1.5}}}},
+    {"paneles": {"cpu": {"grafica": {"color": "rojo"}}}},
+    {"paneles": {"procesos": {"cantidad": 0}}},
+    {"paneles": {"picos": {"metricas": ["disco"]}}},
+    {"paneles": {"picos": {"pico": 80, "rearme": 90}}},
+    {"paneles": {"tirones": {"ventana": 9}}},
+    {"paneles": {"tirones": {"caida": 0}}},
+    {"paneles": {"tirones": {"carga_minima": 150}}},
+])
+def test_valores_fuera_de_rango(tmp_path, datos):
+    with pytest.raises(ValueError):
+        cargar(tmp_path, datos)
@@ -0,0 +1,51 @@
+"""
+Tests del detector de tirones con trazas sintéticas (sin Qt ni hardware).
+
+    python -m pytest test_detector_tirones.py
+"""
+import random
+
+import pytest
+
+from detector_tirones import DetectorTirones, traza_sintetica
+
+
+def ejecutar(traza):
+    detector = DetectorTirones()
+    return [informe for t, muestra in traza
+            if (informe := detector.añadir_muestra(t, muestra))]
+
+
+def traza_pantalla_carga(ticks=300, inicio=100, fin=140, seed=2):
+    """ Juego al 95%, pantalla de carga con la GPU al 20% y vuelta al 95%. """
+    rng = random.Random(seed)
+    for t in range(ticks):
+        gpu = 20 if inicio <= t < fin else 95
+        yield t, {'gpu': gpu + rng.uniform(-3, 3), 'vram': 80 + rng.uniform(-2, 2),
+                  'nucleos': [40 + rng.uniform(-10, 10) for _ in range(8)],
+                  'top_proceso': ('game.exe', 20 + rng.uniform(-2, 2))}
+
+
+def test_detecta_los_tirones_inyectados():
+    informes = ejecutar(traza_sintetica())
+    assert [informe['t'] for informe in informes] == [120, 250, 330]
+
+
+def test_la_causa_inyectada_es_la_anomalia_principal():
+    informes = ejecutar(traza_sintetica())
+    principales = [(i['anomalias'][0]['fuente'], i['anomalias'][0]['detalle']) for i in informes]
+    assert principales == [('disco', 'PhysicalDrive1'), ('nucleo', 3), ('proceso', 'antivirus.exe')]
+
+
+def test_sin_informes_con_carga_estable():
+    assert ejecutar(traza_sintetica(tirones=())) == []
+
+
+def test_sin_informes_en_pantalla_de_carga():
+    assert ejecutar(traza_pantalla_carga()) == []
+
+
+@pytest.mark.parametrize("opciones", [{'ventana': 9}, {'ventana': 2}, {'caida': 0}, {'caida': -5}])
+def test_rechaza_configuraciones_que_no_detectan_o_inundan(opciones):
+    with pytest.raises(ValueError):
+        DetectorTirones(**opciones)
@@ -0,0 +1,93 @@
+"""
+Tests del diezmado min/max de HistorialCurva contra un cálculo por fuerza bruta.
+
+    python -m pytest test_graficas.py
+"""
+import random
+
+import numpy as np
+import pytest
+
+from graficas import HistorialCurva
+
+
+def valores(historia, inicio, fin):
+    """ Muestras de los índices absolutos [inicio, fin); las anteriores a la
+    primera muestra son los ceros con los que empieza el búfer. """
+    return [historia[i] if i >= 0 else 0.0 for i in range(inicio, fin)]
+
+
+def comprobar(curva, historia):
+    """ Compara datos() con el min/max por fuerza bruta de la ventana visible. """
+    x, y = curva.datos()
+    assert not np.isnan(y).any()
+    inicio = curva.total - curva.capacidad
+    ventana = valores(historia, inicio, curva.total)
+
+    if curva.cubeta == 1:
+        assert np.array_equal(x, np.arange(curva.capacidad))
+        assert np.array_equal(y, np.array(ventana, dtype=np.float32))
+        return
+
+    b = curva.cubeta
+    inicios = x[0::2].astype(int)
+    assert np.array_equal(x[0::2], x[1::2])
+    assert (np.diff(inicios) == b).all()
+    assert inicios[0] + b > 0, "cubeta entera antes del borde izquierdo"
+    assert inicios[0] <= 0 and inicios[-1] + b >= curva.capacidad, "la ventana no está cubierta"
+
+    for x0, minimo, maximo in zip(inicios, y[0::2], y[1::2]):
+        dentro = ventana[max(x0, 0):min(x0 + b, curva.capacidad)]
+        if x0 >= 0:
+            assert (minimo, maximo) == (min(dentro), max(dentro))
+        else:
+            # La cubeta del borde izquierdo puede incluir muestras reales anteriores a la ventana
+            cubeta = valores(historia, inicio + x0, inicio + x0 + b)
+            assert min(cubeta) <= minimo <= min(dentro)
+            assert max(dentro) <= maximo <= max(cubeta)
+
+
+def alimentar(curva, historia, rng, n, ajustes=0.0):
+    for _ in range(n):
+        valor = float(np.float32(rng.uniform(0, 100)))
+        historia.append(valor)
+        curva.añadir(valor)
+        if rng.random() < ajustes:
+            curva.ajustar_columnas(rng.randint(1, 200))
+            comprobar(curva, historia)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_datos_coincide_con_fuerza_bruta(seed):
+    rng = random.Random(seed)
+    capacidad = rng.randint(5, 400)
+    curva, historia = HistorialCurva(capacidad, rng.randint(1, 200)), []
+    alimentar(curva, historia, rng, rng.randint(0, 3 * capacidad))
+    comprobar(curva, historia)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_datos_tras_ajustar_columnas(seed):
+    rng = random.Random(seed)
+    capacidad = rng.randint(5, 400)
+    curva, historia = HistorialCurva(capacidad, rng.randint(1, 200)), []
+    alimentar(curva, historia, rng, rng.randint(0, 3 * capacidad), ajustes=0.02)
+    curva.ajustar_columnas(rng.randint(1, 200))
+    comprobar(curva, historia)
+    alimentar(curva, historia, rng, rng.randint(0, capacidad))
+    comprobar(curva, historia)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_datos_tras_copiar_historial(seed):
+    rng = random.Random(seed)
+    origen, historia = HistorialCurva(rng.randint(5, 400), rng.randint(1, 200)), []
+    alimentar(origen, historia, rng, rng.randint(0, 3 * origen.capacidad))
+
+    curva = HistorialCurva(rng.randint(5, 400), rng.randint(1, 200))
+    curva.copiar_historial(origen)
+    # Lo que no cabía en la curva de origen se perdió: para la nueva son ceros
+    historia = [0.0] * max(0, len(historia) - origen.capacidad) + historia[-origen.capacidad:]
+    comprobar(curva, historia)
+    alimentar(curva, historia, rng, rng.randint(0, 2 * curva.capacidad))
+    comprobar(curva, historia)